@@ -1,8 +1,21 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, Response, stream_with_context
 from flask_cors import CORS
-from interview_logic import interviewer_agent, extract_text, report_agent, speak_text, generate_pdf_report
-from face_detection import face_detector
+from interview_logic import interviewer_agent_stream, structured_interviewer_agent, repair_response, RESPONSE_MODE, render_pdf_report, generate_evaluation
+from face_executor import face_executor, FaceAnalysisBusy
+from evidence import EvidenceBuffer
+from llm_client import llm_client, LLMTimeoutError
+from question_cache import opening_question_cache
+from prefetch import question_prefetcher, PREFETCH_ENABLED
+from transcript_summary import transcript_summarizer
+from report_cache import report_cache, transcript_key
+from report_jobs import report_jobs, ReportQueueFull
+from tts_cache import tts_cache
+from tts_backends import tts_backend, audio_mimetype
+from audio_jobs import audio_jobs, split_sentences, AUDIO_CHUNK_LOOKAHEAD
+from response_parser import parse_response, stream_parser_for, missing_fields, field_label, format_instructions
 from tts_manager import speak_intro, speak_question, start_answer_recording, stop_answer_recording
+from warmup import warm_up, WARM_UP
+from lazy_imports import loaded_modules
 from dotenv import load_dotenv
 import uuid
 import os
@@ -10,12 +23,34 @@ import time
 import re
 import random
 import base64
+import json
 
 load_dotenv()
 
+# Longest time /api/audio/<id> blocks waiting for synthesis to finish
+AUDIO_WAIT = float(os.getenv("AUDIO_WAIT", "15"))
+# "chunked" streams speech sentence by sentence, "full" synthesizes one clip per response
+AUDIO_MODE = os.getenv("AUDIO_MODE", "chunked").lower()
+# Frames a single /api/face_detection/batch request may carry
+FACE_BATCH_MAX = int(os.getenv("FACE_BATCH_MAX", "10"))
+# Recommended proctoring sample interval bounds (seconds). Problems snap it back to
+# the minimum, which the 5-frame / 10-second escalation was designed around;
+# steady good frames stretch it by FACE_SAMPLE_BACKOFF up to the maximum. Full-frame
+# scans and rechecks also run on a clock (FACE_FULL_SCAN_SECONDS, FACE_RECHECK_SECONDS),
+# so backing off does not delay noticing a second face.
+FACE_SAMPLE_MIN = float(os.getenv("FACE_SAMPLE_MIN", "2"))
+FACE_SAMPLE_MAX = float(os.getenv("FACE_SAMPLE_MAX", "8"))
+FACE_SAMPLE_BACKOFF = float(os.getenv("FACE_SAMPLE_BACKOFF", "1.5"))
+# Longest time /api/report and the PDF endpoints block waiting for a report job
+REPORT_WAIT = float(os.getenv("REPORT_WAIT", "60"))
+
 app = Flask(__name__, static_folder="static", static_url_path="/")
 CORS(app)
 
+# Heavy modules and devices load on first use unless WARM_UP asks for them at boot
+# (not in face-analysis worker processes, which re-import this module under spawn)
+warm_up_timings = warm_up(WARM_UP) if WARM_UP and __name__ != "__mp_main__" else {}
+
 @app.route("/")
 def home():
     """
@@ -47,28 +82,296 @@ def health_check():
         "status": "healthy",
         "backend": "running",
         "gemini": "configured",
+        "llm": llm_client.stats(),
+        "opening_cache": opening_question_cache.stats(),
+        "prefetch": question_prefetcher.stats(),
+        "summary": transcript_summarizer.stats(),
+        "report_cache": report_cache.stats(),
+        "report_jobs": report_jobs.stats(),
         "gtts": "configured",
+        "tts_backend": tts_backend.name,
+        "tts_failovers": getattr(tts_backend, "failovers", 0),
+        "tts_cache": tts_cache.stats(),
+        "audio_jobs": audio_jobs.stats(),
+        "face_detection": face_executor.stats(),
+        "warm_up": warm_up_timings,
+        "loaded_modules": loaded_modules(),
         "timestamp": time.time()
     })
 
 
 sessions = {}
 
-def parse_response(resp):
-    parts = {"intro": "", "feedback": "", "decision": "", "question": ""}
-    for line in resp.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        if line.upper().startswith("INTRO:"):
-            parts["intro"] = line.split(":", 1)[1].strip()
-        elif line.upper().startswith("FEEDBACK:"):
-            parts["feedback"] = line.split(":", 1)[1].strip()
-        elif line.upper().startswith("DECISION:"):
-            parts["decision"] = line.split(":", 1)[1].strip().upper()
-        elif line.upper().startswith("QUESTION:"):
-            parts["question"] = line.split(":", 1)[1].strip()
-    return parts
+def sse_event(event, data):
+    """
+    Format one Server-Sent Event
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def gemini_error_message(e):
+    """
+    Map a Gemini exception to a user-facing message
+    """
+    error_message = str(e)
+    if isinstance(e, LLMTimeoutError):
+        return "The interviewer is busy right now. Please try again in a moment."
+    if 'quota' in error_message.lower() or 'billing' in error_message.lower():
+        return "Gemini quota exceeded. Please check your Gemini API billing at https://ai.google.dev/billing"
+    elif 'api' in error_message.lower() or 'key' in error_message.lower():
+        return "Gemini API key issue. Please check your API key configuration."
+    return "Gemini service unavailable. Please try again later."
+
+def difficulty_for(question_number, max_questions):
+    """
+    Difficulty tier for a question number, based on interview progress
+    """
+    progress_ratio = question_number / max_questions
+    if progress_ratio > 0.7:
+        return "hard"
+    elif progress_ratio > 0.4:
+        return "medium"
+    return "easy"
+
+def build_answer_prompt(session, user_answer, draft_question=None):
+    """
+    Build the per-turn interviewer prompt for an answer.
+    When a prefetched `draft_question` is given, the model only writes feedback
+    and replaces the draft only if the answer makes it unsuitable.
+    Returns (full_prompt, is_last_answer).
+    """
+    jd = session.get("jd", "")
+    candidate_level = session.get("candidate_level", "UNKNOWN")
+    current_q_num = session.get("question_count", 1)
+    max_q = session.get("max_questions", 5)
+
+    # Check if this is the last question answer
+    is_last_answer = current_q_num >= int(max_q)
+    
+    print(f"DEBUG: Processing answer for Q{current_q_num} of {max_q}. Is last? {is_last_answer}")
+
+    difficulty_level = difficulty_for(current_q_num, max_q)
+
+    fields = [
+        ("feedback", "<your brief feedback here>"),
+        ("decision", "INTERVIEW_COMPLETE" if is_last_answer else "NEXT_QUESTION"),
+    ]
+    if is_last_answer:
+        question_line = "(No question - this is final)"
+    elif draft_question:
+        question_line = (
+            f'Prepared next question: "{draft_question}"\n'
+            'Only if the answer makes the prepared question unsuitable (e.g. it must follow up on what the candidate said), add:\n'
+            f'{field_label("question", RESPONSE_MODE)} <replacement question>'
+        )
+    else:
+        fields.append(("question", "<your next question here>"))
+        question_line = ""
+
+    feedback_prompt = (
+        f'Answer: "{user_answer}"\n'
+        f'Question: "{session["current_question"]}"\n'
+        f'Job: {jd}\n'
+        f'Level: {candidate_level}\n'
+        f'Q{current_q_num}/{max_q} ({difficulty_level})\n'
+        f'{"FINAL - END" if is_last_answer else "Continue - MUST provide next question"}\n\n'
+        f'IMPORTANT: {format_instructions(fields, RESPONSE_MODE)}\n'
+        f'{question_line}'
+    ).rstrip()
+
+    # Reduce context for faster response - only last entry, plus the
+    # bounded rolling summary of earlier turns
+    context_str = "\n".join(session['transcript'][-1:])  # Only last 1 entry
+    summary = transcript_summarizer.summary(session)
+    if summary:
+        context_str = f"Earlier in the interview:\n{summary}\n\nLatest: {context_str}"
+    full_prompt = f"{feedback_prompt}\n\nContext: {context_str}"
+    return full_prompt, is_last_answer
+
+def report_session_data(session_id, session):
+    """
+    Session fields used to build the interview report
+    """
+    transcript_summarizer.update(session)
+    return {
+        'session_id': session_id,
+        'jd': session['jd'],
+        'experience': session['experience'],
+        'transcript': session['transcript'],
+        'summary': transcript_summarizer.summary(session),
+        'strikes': session.get('strikes', 0),
+        'cheating_detected': session.get('strikes', 0) > 0,
+        'evidence': session['evidence'].to_report() if session.get('evidence') else []
+    }
+
+def build_session_report(session_data):
+    """
+    Generate the AI evaluation once and render the PDF from it
+    """
+    try:
+        evaluation = generate_evaluation(session_data)
+    except Exception as e:
+        print(f"Error generating evaluation: {e}")
+        return {
+            "evaluation": None,
+            "pdf_bytes": render_pdf_report(session_data, evaluation=f"Evaluation generation failed: {str(e)}")
+        }
+    return {
+        "evaluation": evaluation,
+        "pdf_bytes": render_pdf_report(session_data, evaluation=evaluation)
+    }
+
+def get_session_report(session_id, session):
+    """
+    Evaluation and PDF for the session's current transcript, built at most once
+    """
+    return report_cache.get_or_build(session, report_session_data(session_id, session), build_session_report)
+
+def report_pdf_url(session_id, download=False):
+    return f"/api/report/{session_id}/download" if download else f"/api/report/{session_id}/pdf"
+
+def wait_for_report(session_id, session, wait=0, retry=False):
+    """
+    Queue the session's report as a background job (or join the one already
+    running for this transcript) and wait up to `wait` seconds for it.
+    A failed job, or one whose evaluation failed, is only rerun with retry=True.
+    Returns (job status dict, report entry or None while it is not ready).
+    """
+    key = transcript_key(session)
+    entry = session.get('report_cache')
+    if entry and entry['key'] == key:
+        return {"session_id": session_id, "key": key, "status": "done", "error": None, "degraded": False, "elapsed": 0.0}, entry
+    try:
+        report_jobs.submit(session_id, key, lambda: get_session_report(session_id, session), retry=retry)
+    except ReportQueueFull as e:
+        print(f"DEBUG: report queue full, session {session_id} must retry: {e}")
+        return {"session_id": session_id, "key": key, "status": "busy", "error": str(e), "degraded": False, "elapsed": 0.0}, None
+    return report_jobs.get(session_id, wait=wait)
+
+def report_fields(session_id, job, report=None):
+    """
+    Response fields describing a report job. The status URL is the job handle;
+    the PDF URLs answer 202 until the job is done.
+    """
+    fields = {
+        "report_job": job['key'],
+        "report_status": job['status'],
+        "report_generated": False,
+        "status_url": f"/api/report/status?session_id={session_id}",
+        "pdf_url": report_pdf_url(session_id),
+        "download_url": report_pdf_url(session_id, download=True)
+    }
+    if report is not None:
+        fields["report_generated"] = True
+        # The PDF only carries a failure note instead of the AI evaluation; POST /api/report retries it
+        fields["evaluation_failed"] = not report['evaluation']
+        if not report['pdf_bytes']:
+            # Fall back to the evaluation text if PDF fails
+            fields.update({"pdf_url": None, "download_url": None, "text_report": report['evaluation']})
+    elif job['error']:
+        fields["error"] = job['error']
+    return fields
+
+def report_etag(report):
+    """
+    The transcript hash alone would let a client revalidate a fallback PDF
+    against the one rebuilt with the evaluation, so the etag says which it is
+    """
+    return f"{report['key']}-{'evaluated' if report['evaluation'] else 'fallback'}"
+
+def binary_response(data, mimetype, etag, filename=None, download=False, max_age=0):
+    """
+    Serve bytes with Content-Length, a strong ETag, conditional GET (304)
+    and single Range requests (206)
+    """
+    response = Response(data, mimetype=mimetype)
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    if filename:
+        disposition = "attachment" if download else "inline"
+        response.headers["Content-Disposition"] = f'{disposition}; filename="{filename}"'
+    return response.make_conditional(request, accept_ranges=True, complete_length=len(data))
+
+def audio_fields(audio_text):
+    """
+    Queue speech synthesis and return the response fields pointing at it.
+    In chunked mode only the first sentences are synthesized up front and
+    'audio_url' points at the sentence-streaming endpoint.
+    'audio' stays in the payload (always None) for older clients.
+    """
+    # Only MP3 frames can be concatenated into one stream
+    chunked = AUDIO_MODE == "chunked" and tts_backend.mimetype == "audio/mpeg"
+    if chunked:
+        audio_id = audio_jobs.submit(audio_text, start=False)
+        for sentence in split_sentences(audio_text)[:AUDIO_CHUNK_LOOKAHEAD]:
+            audio_jobs.submit(sentence)
+    else:
+        audio_id = audio_jobs.submit(audio_text)
+    if not audio_id:
+        return {"audio": None, "audio_id": None, "audio_url": None, "audio_stream_url": None}
+    stream_url = f"/api/audio/{audio_id}/stream"
+    return {
+        "audio": None,
+        "audio_id": audio_id,
+        "audio_url": stream_url if chunked else f"/api/audio/{audio_id}",
+        "audio_stream_url": stream_url
+    }
+
+def required_answer_fields(is_last_answer, draft_question=None):
+    """
+    Fields the interviewer must return for an answer turn
+    """
+    if is_last_answer or draft_question:
+        return ["feedback", "decision"]
+    return ["feedback", "decision", "question"]
+
+def build_draft_question_prompt(session, question_number):
+    """
+    Prompt for a speculative next question that does not depend on the answer
+    """
+    max_q = session.get("max_questions", 5)
+    return (
+        "You are an experienced interviewer. "
+        f"Job Description: {session.get('jd', '')}. "
+        f"Inferred Candidate Level: {session.get('candidate_level', 'UNKNOWN')}. "
+        f"This is question {question_number} of {max_q} ({difficulty_for(question_number, max_q)}). "
+        f'The previous question was: "{session.get("current_question", "")}". Do not repeat it.\n'
+        "Respond with exactly one labeled line:\n"
+        "QUESTION: <short, one-line technical question that matches the JD and inferred level>"
+    )
+
+def schedule_prefetch(session_id, session):
+    """
+    Start drafting the next question in the background for opted-in sessions
+    """
+    if not session.get("prefetch") or not session.get("active"):
+        return
+    next_q_num = session.get("question_count", 1) + 1
+    if next_q_num > int(session.get("max_questions", 5)):
+        return
+    question_prefetcher.schedule(session_id, next_q_num, build_draft_question_prompt(session, next_q_num))
+
+def take_prefetched_question(session_id, session):
+    """
+    Return the prefetched draft for the upcoming question, if one is ready
+    """
+    if not session.get("prefetch"):
+        return None
+    if session.get("question_count", 1) >= int(session.get("max_questions", 5)):
+        question_prefetcher.cancel(session_id)
+        return None
+    draft = question_prefetcher.take(session_id, session.get("question_count", 1) + 1)
+    if not draft:
+        return None
+    return parse_response(draft).get("question") or None
+
+def end_session(session_id, session):
+    """
+    Mark a session inactive and drop any background work for it
+    """
+    session['active'] = False
+    question_prefetcher.cancel(session_id)
+
 
 @app.route('/api/start', methods=['POST'])
 def start_interview():
@@ -76,6 +379,7 @@ def start_interview():
     jd = data.get('jd', 'General Software Engineering')
     experience = data.get('experience', 'Not specified')
     question_count = data.get('questionCount', 5)
+    prefetch = bool(data.get('prefetch', PREFETCH_ENABLED))
     experience_text = str(experience)
     
     
@@ -156,16 +460,24 @@ def start_interview():
         "Prefer scenario-based, architecture, trade-offs, debugging, performance, and deployment questions aligned to the JD. "
         "For JUNIOR, fundamentals are acceptable but keep them practical.\n"
         "Start a professional interview. This is question 1 of {question_count}. Start with easier questions and progressively increase difficulty. "
-        "Respond with exactly two labeled lines:\n"
-        "INTRO: <one-line introduction to the candidate>\n"
-        "QUESTION: <short, one-line technical question that matches the JD and inferred level>"
+        + format_instructions([
+            ("intro", "<one-line introduction to the candidate>"),
+            ("question", "<short, one-line technical question that matches the JD and inferred level>"),
+        ], RESPONSE_MODE)
     )
     
+    cache_key = opening_question_cache.make_key(jd, candidate_level, question_count)
+    
     try:
-        print(f"DEBUG: Calling interviewer agent with prompt: {init_prompt[:200]}...")
-        interviewer_response = interviewer_agent(init_prompt)
-        text_response = interviewer_response
-        print(f"DEBUG: FULL RAW Agent response: {repr(text_response)}")
+        cached = opening_question_cache.get(cache_key)
+        if cached:
+            print(f"DEBUG: Opening question cache hit for level {candidate_level}")
+            text_response = f"INTRO: {cached['intro']}\nQUESTION: {cached['question']}"
+            parsed = parse_response(text_response)
+        else:
+            print(f"DEBUG: Calling interviewer agent with prompt: {init_prompt[:200]}...")
+            parsed, text_response = structured_interviewer_agent(init_prompt, ["intro", "question"])
+            print(f"DEBUG: FULL RAW Agent response: {repr(text_response)}")
         
         # Check for empty response (likely due to swallowed exception like 429)
         if not text_response or not str(text_response).strip() or text_response == "None":
@@ -177,7 +489,6 @@ def start_interview():
                 "audio": None
             }), 500
 
-        parsed = parse_response(text_response)
         print(f"DEBUG: Parsed response: {parsed}")
         
         # Validate Gemini response
@@ -191,6 +502,9 @@ def start_interview():
                 "audio": None
             }), 500
         
+        if not cached:
+            opening_question_cache.put(cache_key, parsed.get("intro"), parsed.get("question"))
+        
         sessions[session_id] = {
             "history": [], 
             "jd": jd,
@@ -202,12 +516,14 @@ def start_interview():
             "strikes": 0,
             "current_question": parsed.get("question"),
             "active": True,
+            "prefetch": prefetch,
         }
+        schedule_prefetch(session_id, sessions[session_id])
         
         audio_text = f"{parsed.get('intro')} {parsed.get('question')}"
-        audio_base64 = speak_text(audio_text)
+        audio_info = audio_fields(audio_text)
         
-        print(f"DEBUG: Returning Gemini-generated intro: '{parsed.get('intro')}', question: '{parsed.get('question')}', audio: {'success' if audio_base64 else 'failed'}")
+        print(f"DEBUG: Returning Gemini-generated intro: '{parsed.get('intro')}', question: '{parsed.get('question')}', audio job: {audio_info['audio_id']}")
 
         # Speak introduction
         try:
@@ -219,7 +535,7 @@ def start_interview():
             "session_id": session_id,
             "intro": parsed.get("intro"),
             "question": parsed.get("question"),
-            "audio": None,  # TTS handled separately
+            **audio_info,
             "question_count": question_count,
             "current_question": 1,
             "max_questions": question_count
@@ -229,13 +545,7 @@ def start_interview():
         print("DEBUG: Gemini failed - no fallback allowed")
         
         # Return error instead of fallback
-        error_message = str(e)
-        if 'quota' in error_message.lower() or 'billing' in error_message.lower():
-            user_message = "Gemini quota exceeded. Please check your Gemini API billing at https://ai.google.dev/billing"
-        elif 'api' in error_message.lower() or 'key' in error_message.lower():
-            user_message = "Gemini API key issue. Please check your API key configuration."
-        else:
-            user_message = "Gemini service unavailable. Please try again later."
+        user_message = gemini_error_message(e)
         
         return jsonify({
             "error": user_message,
@@ -274,57 +584,19 @@ def submit_answer():
     # Logic fix: Don't increment yet, use current count for prompt
     # We will increment after successful generation of next question
     # or just before returning if complete.
-    
-    jd = session.get("jd", "")
-    experience_text = session.get("experience", "")
-    candidate_level = session.get("candidate_level", "UNKNOWN")
+    draft_question = take_prefetched_question(session_id, session)
+    full_prompt, is_last_answer = build_answer_prompt(session, user_answer, draft_question)
     current_q_num = session.get("question_count", 1)
     max_q = session.get("max_questions", 5)
-    
-    # Calculate progress
-    progress_ratio = current_q_num / max_q
-
-    # Check if this is the last question answer
-    is_last_answer = current_q_num >= int(max_q)
-    
-    print(f"DEBUG: Processing answer for Q{current_q_num} of {max_q}. Is last? {is_last_answer}")
-
-    jd = session.get("jd", "")
-    experience_text = session.get("experience", "")
-    candidate_level = session.get("candidate_level", "UNKNOWN")
-    current_q_num = session.get("question_count", 1)
-    max_q = session.get("max_questions", 5)
-    progress_ratio = current_q_num / max_q
-
-    difficulty_level = "easy"
-    if progress_ratio > 0.7:
-        difficulty_level = "hard"
-    elif progress_ratio > 0.4:
-        difficulty_level = "medium"
-
-    feedback_prompt = (
-        f'Answer: "{user_answer}"\n'
-        f'Question: "{session["current_question"]}"\n'
-        f'Job: {jd}\n'
-        f'Level: {candidate_level}\n'
-        f'Q{current_q_num}/{max_q} ({difficulty_level})\n'
-        f'{"FINAL - END" if is_last_answer else "Continue - MUST provide next question"}\n\n'
-        'IMPORTANT: You MUST respond with EXACTLY this format:\n'
-        'FEEDBACK: <your brief feedback here>\n'
-        f'DECISION: {"INTERVIEW_COMPLETE" if is_last_answer else "NEXT_QUESTION"}\n'
-        f'{"(No QUESTION line - this is final)" if is_last_answer else "QUESTION: <your next question here>"}'
-    )
-
-    # Reduce context for faster response - only last entry
-    context_str = "\n".join(session['transcript'][-1:])  # Only last 1 entry
-    full_prompt = f"{feedback_prompt}\n\nContext: {context_str}"
 
     try:
         print(f"DEBUG: Calling interviewer agent with full prompt: {full_prompt[:300]}...")
-        interviewer_response = interviewer_agent(full_prompt)
-        text_response = interviewer_response
+        parsed, text_response = structured_interviewer_agent(
+            full_prompt, required_answer_fields(is_last_answer, draft_question)
+        )
         print(f"DEBUG: Agent response: {text_response[:200]}...")
-        parsed = parse_response(text_response)
+        if draft_question and not parsed.get('question'):
+            parsed['question'] = draft_question
         
         # Check if the response is valid (has required fields)
         if not parsed.get('feedback') or not parsed.get('decision'):
@@ -347,7 +619,7 @@ def submit_answer():
         
         # Check if decision is complete or we forced it
         if parsed.get('decision') == 'INTERVIEW_COMPLETE' or is_last_answer:
-            session['active'] = False
+            end_session(session_id, session)
             session['question_count'] += 1 # Increment to show we completed this question
             
             audio_text = parsed.get('feedback')
@@ -358,73 +630,18 @@ def submit_answer():
             
             print(f"DEBUG: Interview completed - Q{current_q_num} of {max_q}")
             
-            # Generate report automatically
-            try:
-                pdf_base64 = generate_pdf_report({
-                    'session_id': session_id,
-                    'jd': session['jd'],
-                    'experience': session['experience'],
-                    'transcript': session['transcript'],
-                    'strikes': session.get('strikes', 0),
-                    'cheating_detected': session.get('strikes', 0) > 0
-                })
-                
-                if pdf_base64:
-                    return jsonify({
-                        "feedback": parsed.get("feedback") or audio_text,
-                        "decision": "INTERVIEW_COMPLETE",
-                        "next_question": None,
-                        "audio": speak_text(audio_text),
-                        "report_generated": True,
-                        "pdf_base64": pdf_base64,
-                        "download_url": f"data:application/pdf;base64,{pdf_base64}",
-                        "note": "Interview completed with report"
-                    })
-                else:
-                    # Generate text report if PDF fails
-                    transcript_text = "\n".join(session['transcript'])
-                    report_prompt = f"""
-                    Based on this interview transcript, provide a comprehensive evaluation:
-                    
-                    Job Description: {session['jd']}
-                    Experience: {session['experience']}
-                    
-                    Transcript:
-                    {transcript_text}
-                    
-                    Please provide:
-                    1. Overall Assessment (1-10 scale)
-                    2. Technical Skills Evaluation
-                    3. Communication Skills
-                    4. Problem-Solving Ability
-                    5. Strengths
-                    6. Areas for Improvement
-                    7. Recommendation (Hire/Consider/Reject)
-                    """
-                    
-                    text_report = report_agent(report_prompt)
-                    
-                    return jsonify({
-                        "feedback": parsed.get("feedback") or audio_text,
-                        "decision": "INTERVIEW_COMPLETE",
-                        "next_question": None,
-                        "audio": speak_text(audio_text),
-                        "report_generated": True,
-                        "text_report": text_report,
-                        "note": "Interview completed with text report"
-                    })
-                    
-            except Exception as e:
-                print(f"Error generating report: {e}")
-                return jsonify({
-                    "feedback": parsed.get("feedback") or audio_text,
-                    "decision": "INTERVIEW_COMPLETE",
-                    "next_question": None,
-                    "audio": speak_text(audio_text),
-                    "report_generated": False,
-                    "error": "Report generation failed",
-                    "note": "Interview completed but report generation failed"
-                })
+            audio_info = audio_fields(audio_text)
+            
+            # Build the report in the background; the client polls status_url
+            job, report = wait_for_report(session_id, session)
+            return jsonify({
+                "feedback": parsed.get("feedback") or audio_text,
+                "decision": "INTERVIEW_COMPLETE",
+                "next_question": None,
+                **audio_info,
+                **report_fields(session_id, job, report),
+                "note": "Interview completed; report is being generated"
+            })
         else:
             # For non-final questions, we must have a next question
             if not parsed.get('question'):
@@ -441,17 +658,19 @@ def submit_answer():
             session['current_question'] = parsed.get('question')
             session['transcript'].append(f"Interviewer: {parsed.get('question')}")
             session['question_count'] += 1 # Move to next question number
+            schedule_prefetch(session_id, session)
+            transcript_summarizer.update(session)
             audio_text = f"{parsed.get('feedback')} {parsed.get('question')}"
 
-        audio_base64 = speak_text(audio_text)
+        audio_info = audio_fields(audio_text)
 
-        print(f"DEBUG: Returning Gemini-generated feedback: '{parsed.get('feedback')}', decision: '{parsed.get('decision')}', next_question: '{parsed.get('question')}', audio: {'success' if audio_base64 else 'failed'}")
+        print(f"DEBUG: Returning Gemini-generated feedback: '{parsed.get('feedback')}', decision: '{parsed.get('decision')}', next_question: '{parsed.get('question')}', audio job: {audio_info['audio_id']}")
 
         return jsonify({
             "feedback": parsed.get("feedback"),
             "decision": parsed.get("decision"),
             "next_question": parsed.get("question"),
-            "audio": audio_base64,
+            **audio_info,
             "note": "Generated by Gemini AI"
         })
         
@@ -460,13 +679,7 @@ def submit_answer():
         print("DEBUG: Gemini failed - no fallback allowed")
         
         # Return error instead of fallback
-        error_message = str(e)
-        if 'quota' in error_message.lower() or 'billing' in error_message.lower():
-            user_message = "Gemini quota exceeded. Please check your Gemini API billing at https://ai.google.dev/billing"
-        elif 'api' in error_message.lower() or 'key' in error_message.lower():
-            user_message = "Gemini API key issue. Please check your API key configuration."
-        else:
-            user_message = "Gemini service unavailable. Please try again later."
+        user_message = gemini_error_message(e)
         
         return jsonify({
             "error": user_message,
@@ -476,6 +689,144 @@ def submit_answer():
             "audio": None
         }), 500
 
+@app.route('/api/answer/stream', methods=['GET', 'POST'])
+def submit_answer_stream():
+    """
+    Streaming variant of /api/answer using Server-Sent Events.
+    Emits 'feedback_delta' events as feedback tokens arrive, then 'feedback',
+    'decision' and 'question' as soon as each labeled line completes, followed
+    by 'done' (final turn state) and 'audio'.
+    """
+    data = request.get_json(silent=True) or request.args
+    session_id = data.get('session_id')
+    user_answer = data.get('answer')
+    
+    if not session_id:
+        return jsonify({"error": "No session_id provided"}), 400
+        
+    if session_id not in sessions:
+        return jsonify({"error": "Invalid session"}), 404
+        
+    session = sessions[session_id]
+    
+    if not session['active']:
+        return jsonify({"error": "Interview ended"}), 400
+
+    session['transcript'].append(f"Candidate: {user_answer}")
+    draft_question = take_prefetched_question(session_id, session)
+    full_prompt, is_last_answer = build_answer_prompt(session, user_answer, draft_question)
+
+    required = required_answer_fields(is_last_answer, draft_question)
+
+    def generate():
+        parser = stream_parser_for(RESPONSE_MODE)
+        try:
+            for chunk in interviewer_agent_stream(full_prompt, required=required):
+                for event, value in parser.feed(chunk):
+                    yield sse_event(event, {"text": value} if event == "feedback_delta" else {"value": value})
+            for event, value in parser.close():
+                yield sse_event(event, {"text": value} if event == "feedback_delta" else {"value": value})
+        except Exception as e:
+            print(f"ERROR in Gemini agent stream: {e}")
+            yield sse_event("error", {"error": gemini_error_message(e), "decision": "ERROR"})
+            return
+
+        parsed = parser.parts
+        if RESPONSE_MODE == "json" and missing_fields(parsed, required):
+            try:
+                repaired = repair_response(parser.raw, required)
+            except Exception as e:
+                print(f"ERROR repairing streamed response: {e}")
+                repaired = {}
+            for field in missing_fields(parsed, required):
+                if repaired.get(field):
+                    parsed[field] = repaired[field]
+                    yield sse_event(field, {"value": repaired[field]})
+        if draft_question and not is_last_answer and not parsed.get('question'):
+            parsed['question'] = draft_question
+            yield sse_event("question", {"value": draft_question})
+        if not parsed.get('feedback') or not parsed.get('decision') or \
+                (not is_last_answer and parsed.get('decision') != 'INTERVIEW_COMPLETE' and not parsed.get('question')):
+            print(f"DEBUG: Invalid streamed agent response: {parser.raw}")
+            yield sse_event("error", {
+                "error": "Gemini agent returned invalid response format. The AI didn't follow the required structure.",
+                "feedback": parsed.get('feedback'),
+                "decision": "ERROR"
+            })
+            return
+
+        session['transcript'].append(f"Feedback: {parsed.get('feedback')}")
+
+        if parsed.get('decision') == 'INTERVIEW_COMPLETE' or is_last_answer:
+            end_session(session_id, session)
+            session['question_count'] += 1
+            audio_text = parsed.get('feedback')
+            if is_last_answer and parsed.get('decision') != 'INTERVIEW_COMPLETE':
+                parsed['decision'] = 'INTERVIEW_COMPLETE'
+                audio_text = f"{parsed.get('feedback')} limit reached. Thank you."
+            parsed['question'] = ""
+            report_info = report_fields(session_id, *wait_for_report(session_id, session))
+        else:
+            session['current_question'] = parsed.get('question')
+            session['transcript'].append(f"Interviewer: {parsed.get('question')}")
+            session['question_count'] += 1
+            schedule_prefetch(session_id, session)
+            transcript_summarizer.update(session)
+            audio_text = f"{parsed.get('feedback')} {parsed.get('question')}"
+            report_info = {}
+
+        yield sse_event("done", {
+            "feedback": parsed.get("feedback"),
+            "decision": parsed.get("decision"),
+            "next_question": parsed.get("question") or None,
+            **report_info,
+            "note": "Generated by Gemini AI"
+        })
+        yield sse_event("audio", audio_fields(audio_text))
+
+    return Response(stream_with_context(generate()), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+
+@app.route('/api/audio/<audio_id>')
+def get_audio(audio_id):
+    """
+    Serve synthesized speech for an audio job.
+    Waits up to `wait` seconds (default AUDIO_WAIT) for the job; returns 202
+    while it is still running so clients can poll with wait=0.
+    """
+    wait = min(float(request.args.get('wait', AUDIO_WAIT)), AUDIO_WAIT)
+    status, audio_bytes = audio_jobs.get(audio_id, wait=wait)
+    
+    if status == "ready":
+        # The audio id is a content hash, so it doubles as a strong ETag. A failover
+        # clip is not cached on disk and must not be reused once the primary engine is back.
+        if tts_cache.contains(audio_id):
+            return binary_response(audio_bytes, audio_mimetype(audio_bytes), audio_id, max_age=86400)
+        return binary_response(audio_bytes, audio_mimetype(audio_bytes), f"{audio_id}-failover")
+    if status == "pending":
+        return jsonify({"status": "pending", "audio_id": audio_id}), 202
+    if status == "failed":
+        return jsonify({"status": "failed", "error": "Speech synthesis failed"}), 500
+    return jsonify({"error": "Unknown audio id"}), 404
+
+@app.route('/api/audio/<audio_id>/stream')
+def stream_audio(audio_id):
+    """
+    Stream synthesized speech sentence by sentence as one chunked audio/mpeg
+    response, so playback starts before the whole clip has been generated
+    """
+    text = audio_jobs.text_for(audio_id)
+    if text is None or tts_backend.mimetype != "audio/mpeg":
+        # Job was pruned, or the engines may return WAV clips that cannot be
+        # concatenated; serve the whole clip instead
+        return get_audio(audio_id)
+    return Response(stream_with_context(audio_jobs.stream(text, wait=AUDIO_WAIT)), mimetype="audio/mpeg", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+
 @app.route('/api/cheat_strike', methods=['POST'])
 def report_cheat():
     data = request.json
@@ -490,11 +841,116 @@ def report_cheat():
     msg = f"Warning {session['strikes']}/5: Suspicious behavior detected."
     
     if session['strikes'] >= 5:
-        session['active'] = False
+        end_session(session_id, session)
         return jsonify({"status": "terminated", "message": "Interview terminated due to suspicious behavior."})
         
     return jsonify({"status": "warning", "message": msg, "strikes": session['strikes']})
 
+def evaluate_frame(session, face_result, quality_result):
+    """
+    Fold one analyzed frame into the session's consecutive failure count.
+    Returns (cheating_detected, cheat_reason); strikes are not touched here.
+    """
+    # Initialize consecutive failure tracking for this session
+    if 'consecutive_failures' not in session:
+        session['consecutive_failures'] = 0
+    
+    # Determine if cheating detected
+    cheating_detected = False
+    cheat_reason = None
+    
+    if face_result['no_faces']:
+        session['consecutive_failures'] += 1
+        if session['consecutive_failures'] >= 5:  # Need 5 consecutive failures (10+ seconds)
+            cheating_detected = True
+            cheat_reason = "No face detected in camera for 10+ seconds"
+    elif face_result['multiple_faces']:
+        session['consecutive_failures'] = 0
+        cheating_detected = True
+        cheat_reason = "Multiple faces detected in camera"
+    elif quality_result.get('is_covered', False):
+        session['consecutive_failures'] += 1
+        if session['consecutive_failures'] >= 5:
+            cheating_detected = True
+            cheat_reason = "Camera appears to be covered for 10+ seconds"
+    elif quality_result.get('is_too_dark', False):
+        session['consecutive_failures'] += 1
+        if session['consecutive_failures'] >= 5:
+            cheating_detected = True
+            cheat_reason = "Camera feed is too dark for 10+ seconds"
+    else:
+        # Reset consecutive failures on successful detection
+        session['consecutive_failures'] = 0
+    
+    return cheating_detected, cheat_reason
+
+def record_strike(session_id, session):
+    """
+    Count a cheating strike; on the fifth, end the interview and queue its report.
+    Returns True if the interview was terminated.
+    """
+    session['strikes'] += 1
+    if session['strikes'] < 5:
+        return False
+    
+    end_session(session_id, session)
+    session['completed'] = True
+    session['completion_reason'] = 'cheating_detected'
+    
+    # Queue the report for the terminated interview; /api/report joins the same job
+    job, _ = wait_for_report(session_id, session)
+    print(f"DEBUG: Report job {job['status']} for terminated interview {session_id}")
+    return True
+
+def completed_verdict(session_id, session):
+    """
+    Verdict for frames that arrive after the interview ended: no strikes,
+    evidence or report rebuild, just the completion status and its report job
+    """
+    return {
+        "cheating_detected": False,
+        "cheat_reason": None,
+        "strikes": session['strikes'],
+        "status": "completed",
+        "message": "Interview has ended.",
+        "completion_reason": session.get('completion_reason', 'interview_complete'),
+        **report_fields(session_id, *wait_for_report(session_id, session))
+    }
+
+def record_evidence(session, analysis, reason):
+    """
+    Keep the flagged frame's thumbnail in the session's bounded evidence buffer
+    """
+    if 'evidence' not in session:
+        session['evidence'] = EvidenceBuffer()
+    session['evidence'].add(analysis.get('evidence'), reason)
+
+def next_sample_interval(session, face_result, quality_result):
+    """
+    Recommend when the client should send its next frame, in seconds.
+    Backs off while exactly one face is steady and the picture is good; any
+    miss, extra face or camera problem returns to FACE_SAMPLE_MIN at once.
+    """
+    steady = (
+        face_result.get('face_count') == 1
+        and quality_result.get('quality_good', False)
+        and session.get('consecutive_failures', 0) == 0
+    )
+    if steady:
+        interval = min(FACE_SAMPLE_MAX, session.get('sample_interval', FACE_SAMPLE_MIN) * FACE_SAMPLE_BACKOFF)
+    else:
+        interval = FACE_SAMPLE_MIN
+    session['sample_interval'] = interval
+    return interval
+
+def wants_debug(data):
+    return request.args.get('debug') == '1' or bool((data or {}).get('debug'))
+
+def face_analysis_busy(e):
+    response = jsonify({"error": str(e), "cheating_detected": False, "retry": True})
+    response.headers['Retry-After'] = '2'
+    return response, 503
+
 @app.route('/api/face_detection', methods=['POST'])
 def detect_faces():
     """
@@ -503,6 +959,8 @@ def detect_faces():
     data = request.json
     session_id = data.get('session_id')
     image_data = data.get('image')  # Base64 encoded image
+    # Full face/quality analysis is only echoed back when asked for
+    debug = wants_debug(data)
     
     if not session_id or not image_data:
         return jsonify({"error": "Missing session_id or image data"}), 400
@@ -512,47 +970,29 @@ def detect_faces():
         
     session = sessions[session_id]
     
+    if not session['active']:
+        return jsonify(completed_verdict(session_id, session))
+    
     try:
-        # Detect faces using OpenCV
-        face_result = face_detector.detect_faces_from_base64(image_data)
-        
-        # Analyze frame quality
-        quality_result = face_detector.analyze_frame_quality(image_data)
-        
-        # Initialize consecutive failure tracking for this session
-        if 'consecutive_failures' not in session:
-            session['consecutive_failures'] = 0
-        
-        # Determine if cheating detected
-        cheating_detected = False
-        cheat_reason = None
-        
-        if face_result['no_faces']:
-            session['consecutive_failures'] += 1
-            if session['consecutive_failures'] >= 5:  # Need 5 consecutive failures (10+ seconds)
-                cheating_detected = True
-                cheat_reason = "No face detected in camera for 10+ seconds"
-        elif face_result['multiple_faces']:
-            session['consecutive_failures'] = 0
-            cheating_detected = True
-            cheat_reason = "Multiple faces detected in camera"
-        elif quality_result.get('is_covered', False):
-            session['consecutive_failures'] += 1
-            if session['consecutive_failures'] >= 5:
-                cheating_detected = True
-                cheat_reason = "Camera appears to be covered for 10+ seconds"
-        elif quality_result.get('is_too_dark', False):
-            session['consecutive_failures'] += 1
-            if session['consecutive_failures'] >= 5:
-                cheating_detected = True
-                cheat_reason = "Camera feed is too dark for 10+ seconds"
-        else:
-            # Reset consecutive failures on successful detection
-            session['consecutive_failures'] = 0
+        # Decode the frame once, then detect faces and analyze quality on it in a worker process
+        try:
+            analysis = face_executor.analyze(image_data, track=session.setdefault('face_track', {}))
+        except (FaceAnalysisBusy, TimeoutError) as e:
+            return face_analysis_busy(e)
+        if not analysis['image_processed']:
+            return jsonify({
+                "error": f"Could not process image: {analysis.get('error')}",
+                "cheating_detected": False
+            }), 400
+        face_result = analysis['face_result']
+        quality_result = analysis['quality_result']
+        
+        cheating_detected, cheat_reason = evaluate_frame(session, face_result, quality_result)
         
         # Log the detection with debug info
         print(f"Face detection for session {session_id}:")
         print(f"  Faces: {face_result['face_count']}, Detected: {face_result['faces_detected']}")
+        print(f"  Unchanged frame, results reused: {analysis.get('skipped', False)}")
         print(f"  Quality - Brightness: {quality_result.get('brightness', 'N/A'):.1f}")
         print(f"  Quality - Blur: {quality_result.get('blur_score', 'N/A'):.1f}")
         print(f"  Quality - Covered: {quality_result.get('is_covered', False)}")
@@ -564,62 +1004,44 @@ def detect_faces():
             print(f"  Cheat reason: {cheat_reason}")
             print(f"  Strikes: {session['strikes'] + 1}/5")
         
+        result = {
+            "cheating_detected": cheating_detected,
+            "cheat_reason": cheat_reason,
+            "face_count": face_result['face_count'],
+            "next_sample_ms": int(next_sample_interval(session, face_result, quality_result) * 1000)
+        }
+        if debug:
+            result.update({
+                "face_result": face_result,
+                "quality_result": quality_result,
+                "consecutive_failures": session['consecutive_failures'],
+                "skipped": analysis.get('skipped', False)
+            })
+        
         # If cheating detected, report it
         if cheating_detected:
-            session['strikes'] += 1
-            
-            if session['strikes'] >= 5:
-                session['active'] = False
-                session['completed'] = True
-                session['completion_reason'] = 'cheating_detected'
-                
-                # Generate report for terminated interview
-                try:
-                    print("Generating report for terminated interview...")
-                    report_data = generate_pdf_report(
-                        session.get('transcript', []),
-                        session.get('jd', 'N/A'),
-                        session.get('experience', 'N/A'),
-                        session['strikes']
-                    )
-                    session['report_generated'] = True
-                    session['report_data'] = report_data
-                    print("Report generated for terminated interview")
-                except Exception as e:
-                    print(f"Error generating report for terminated interview: {e}")
-                    session['report_generated'] = False
-                
-                return jsonify({
-                    "cheating_detected": True,
-                    "cheat_reason": cheat_reason,
+            record_evidence(session, analysis, cheat_reason)
+            if record_strike(session_id, session):
+                result.update({
                     "strikes": session['strikes'],
                     "status": "completed",
-                    "message": "Interview completed due to suspicious activity. Report generated.",
-                    "report_generated": session.get('report_generated', False),
-                    "completion_reason": "cheating_detected",
-                    "face_result": face_result,
-                    "quality_result": quality_result
+                    "message": "Interview completed due to suspicious activity. Report is being generated.",
+                    **report_fields(session_id, *wait_for_report(session_id, session)),
+                    "completion_reason": "cheating_detected"
                 })
             else:
-                return jsonify({
-                    "cheating_detected": True,
-                    "cheat_reason": cheat_reason,
+                result.update({
                     "strikes": session['strikes'],
                     "status": "warning",
-                    "message": f"Warning {session['strikes']}/5: {cheat_reason}",
-                    "face_result": face_result,
-                    "quality_result": quality_result
+                    "message": f"Warning {session['strikes']}/5: {cheat_reason}"
                 })
         else:
-            return jsonify({
-                "cheating_detected": False,
-                "cheat_reason": None,
+            result.update({
                 "strikes": session['strikes'],
                 "status": "ok",
-                "message": "Face detection normal",
-                "face_result": face_result,
-                "quality_result": quality_result
+                "message": "Face detection normal"
             })
+        return jsonify(result)
             
     except Exception as e:
         print(f"Error in face detection: {e}")
@@ -628,8 +1050,180 @@ def detect_faces():
             "cheating_detected": False
         }), 500
 
+@app.route('/api/face_detection/batch', methods=['POST'])
+def detect_faces_batch():
+    """
+    Analyze several frames from one session in a single request.
+    Accepts JSON {"session_id", "images": [base64, ...]} or multipart/form-data
+    with a session_id field and one "frames" file part per frame, oldest first.
+    Frames are folded into the strike logic in order and one verdict is returned.
+    """
+    if request.files:
+        data = request.form
+        images = [part.read() for part in request.files.getlist('frames')]
+    else:
+        data = request.json or {}
+        images = data.get('images') or []
+    session_id = data.get('session_id')
+    debug = wants_debug(data)
+    
+    if not session_id or not images:
+        return jsonify({"error": "Missing session_id or frames"}), 400
+    if len(images) > FACE_BATCH_MAX:
+        return jsonify({"error": f"At most {FACE_BATCH_MAX} frames per batch"}), 413
+    
+    if session_id not in sessions:
+        return jsonify({"error": "Invalid session"}), 404
+    
+    session = sessions[session_id]
+    
+    if not session['active']:
+        return jsonify(completed_verdict(session_id, session))
+    
+    try:
+        try:
+            analyses = face_executor.analyze_batch(images, track=session.setdefault('face_track', {}))
+        except (FaceAnalysisBusy, TimeoutError) as e:
+            return face_analysis_busy(e)
+        
+        frames = []
+        cheat_reasons = []
+        terminated = False
+        interval = None
+        for analysis in analyses:
+            if not analysis['image_processed']:
+                frames.append({"processed": False, "error": analysis.get('error')})
+                continue
+            face_result = analysis['face_result']
+            cheating_detected, cheat_reason = evaluate_frame(session, face_result, analysis['quality_result'])
+            interval = next_sample_interval(session, face_result, analysis['quality_result'])
+            frames.append({
+                "processed": True,
+                "face_count": face_result['face_count'],
+                "cheating_detected": cheating_detected,
+                "cheat_reason": cheat_reason
+            })
+            if cheating_detected:
+                cheat_reasons.append(cheat_reason)
+                record_evidence(session, analysis, cheat_reason)
+                if record_strike(session_id, session):
+                    # Later frames no longer matter once the interview has ended
+                    terminated = True
+                    break
+        
+        print(f"Batch face detection for session {session_id}: {len(frames)}/{len(images)} frames, "
+              f"{len(cheat_reasons)} flagged, strikes {session['strikes']}/5")
+        
+        result = {
+            "cheating_detected": bool(cheat_reasons),
+            "cheat_reason": cheat_reasons[-1] if cheat_reasons else None,
+            "cheat_reasons": cheat_reasons,
+            "strikes": session['strikes'],
+            "frames_processed": sum(1 for frame in frames if frame['processed']),
+            "next_sample_ms": int((interval or FACE_SAMPLE_MIN) * 1000)
+        }
+        if debug:
+            result.update({
+                "consecutive_failures": session.get('consecutive_failures', 0),
+                "frames": frames
+            })
+        if terminated:
+            result.update({
+                "status": "completed",
+                "message": "Interview completed due to suspicious activity. Report is being generated.",
+                **report_fields(session_id, *wait_for_report(session_id, session)),
+                "completion_reason": "cheating_detected"
+            })
+        elif cheat_reasons:
+            result.update({
+                "status": "warning",
+                "message": f"Warning {session['strikes']}/5: {cheat_reasons[-1]}"
+            })
+        else:
+            result.update({"status": "ok", "message": "Face detection normal"})
+        return jsonify(result)
+    
+    except Exception as e:
+        print(f"Error in batch face detection: {e}")
+        return jsonify({
+            "error": f"Face detection failed: {str(e)}",
+            "cheating_detected": False
+        }), 500
+
+def report_wait(default=REPORT_WAIT):
+    return max(0.0, min(float(request.args.get('wait', default)), REPORT_WAIT))
+
+def report_pending(session_id, job):
+    """
+    202 while a report job is queued or running, 503 with Retry-After when the
+    queue is full; the body carries the status URL to poll
+    """
+    if job['status'] == "busy":
+        response = jsonify({"error": "Report queue is full, please retry shortly", **report_fields(session_id, job)})
+        response.status_code = 503
+        response.headers["Retry-After"] = "5"
+        return response
+    return jsonify(report_fields(session_id, job)), 202
+
+@app.route('/api/report/status')
+def get_report_status():
+    """
+    Poll the session's background report job.
+    Starts the job if there is none yet (or the transcript changed since),
+    and waits up to `wait` seconds (default 0) for it to finish.
+    A failed job is reported as failed; pass retry=1 to run it again.
+    """
+    session_id = request.args.get('session_id')
+    
+    if not session_id:
+        return jsonify({"error": "No session_id provided"}), 400
+        
+    if session_id not in sessions:
+        return jsonify({"error": "Invalid session"}), 404
+    
+    job, report = wait_for_report(session_id, sessions[session_id], wait=report_wait(0),
+                                  retry=request.args.get('retry') == '1')
+    return jsonify({"session_id": session_id, "elapsed": round(job['elapsed'], 2), **report_fields(session_id, job, report)})
+
+def serve_report_pdf(session_id, download):
+    """
+    Serve the session's PDF report as application/pdf once its job is done.
+    The ETag is the transcript hash, so unchanged reports revalidate with 304.
+    """
+    if session_id not in sessions:
+        return jsonify({"error": "Invalid session"}), 404
+    
+    job, report = wait_for_report(session_id, sessions[session_id], wait=report_wait(),
+                                  retry=request.args.get('retry') == '1')
+    if report is None:
+        if job['status'] == "failed":
+            return jsonify({"error": f"Report generation failed: {job['error']}"}), 500
+        return report_pending(session_id, job)
+    
+    if not report['pdf_bytes']:
+        return jsonify({"error": "PDF generation failed"}), 500
+    
+    return binary_response(
+        report['pdf_bytes'], "application/pdf", report_etag(report),
+        filename=f"interview-report-{session_id[:8]}.pdf",
+        download=download
+    )
+
+@app.route('/api/report/<session_id>/pdf')
+def get_report_pdf(session_id):
+    return serve_report_pdf(session_id, download=request.args.get('download') == '1')
+
+@app.route('/api/report/<session_id>/download')
+def download_report_pdf(session_id):
+    return serve_report_pdf(session_id, download=True)
+
 @app.route('/api/report', methods=['POST'])
 def get_report():
+    """
+    Report summary for a session. Waits up to REPORT_WAIT seconds for the
+    background job, then answers 202 with the status URL to poll.
+    An explicit request, so a previously failed job is retried.
+    """
     data = request.json
     session_id = data.get('session_id')
     
@@ -643,64 +1237,23 @@ def get_report():
     
     print(f"DEBUG: Generating report for session {session_id}")
     
-    try:
-        # Generate PDF report
-        pdf_base64 = generate_pdf_report({
-            'session_id': session_id,
-            'jd': session['jd'],
-            'experience': session['experience'],
-            'transcript': session['transcript']
-        })
-        
-        if pdf_base64:
-            return jsonify({
-                "success": True,
-                "pdf_base64": pdf_base64,
-                "download_url": f"data:application/pdf;base64,{pdf_base64}",
-                "job_description": session['jd'],
-                "experience": session['experience'],
-                "transcript": session['transcript'],
-                "strikes": session.get('strikes', 0)
-            })
-        else:
-            # Fallback to text report if PDF generation fails
-            transcript_text = "\n".join(session['transcript'])
-            report_prompt = f"""
-            Based on this interview transcript, provide a comprehensive evaluation:
-            
-            Job Description: {session['jd']}
-            Experience: {session['experience']}
-            
-            Transcript:
-            {transcript_text}
-            
-            Please provide:
-            1. Overall Assessment (1-10 scale)
-            2. Technical Skills Evaluation
-            3. Communication Skills
-            4. Problem-Solving Ability
-            5. Strengths
-            6. Areas for Improvement
-            7. Recommendation (Hire/Consider/Reject)
-            """
-            
-            text_report = report_agent(report_prompt)
-            
+    job, report = wait_for_report(session_id, session, wait=REPORT_WAIT, retry=True)
+    if report is None:
+        if job['status'] == "failed":
             return jsonify({
-                "success": True,
-                "text_report": text_report,
-                "job_description": session['jd'],
-                "experience": session['experience'],
-                "transcript": session['transcript'],
-                "strikes": session.get('strikes', 0)
-            })
-            
-    except Exception as e:
-        print(f"Error generating report: {e}")
-        return jsonify({
-            "success": False,
-            "error": f"Report generation failed: {str(e)}"
-        }), 500
+                "success": False,
+                "error": f"Report generation failed: {job['error']}"
+            }), 500
+        return report_pending(session_id, job)
+    
+    return jsonify({
+        "success": True,
+        **report_fields(session_id, job, report),
+        "job_description": session['jd'],
+        "experience": session['experience'],
+        "transcript": session['transcript'],
+        "strikes": session.get('strikes', 0)
+    })
 
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
@@ -0,0 +1,173 @@
+# Background speech synthesis jobs for the AI Interview System
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from interview_logic import synthesize_speech
+from tts_cache import tts_cache, normalize_text
+from tts_backends import tts_backend
+
+AUDIO_WORKERS = int(os.getenv("AUDIO_WORKERS", "4"))
+# How long finished jobs stay in memory; their audio also lives in the disk cache
+AUDIO_JOB_TTL = float(os.getenv("AUDIO_JOB_TTL", "600"))
+# Sentences shorter than this are merged with the next one before synthesis
+AUDIO_MIN_CHUNK_CHARS = int(os.getenv("AUDIO_MIN_CHUNK_CHARS", "40"))
+# How many sentence chunks are synthesized ahead of the one being streamed
+AUDIO_CHUNK_LOOKAHEAD = int(os.getenv("AUDIO_CHUNK_LOOKAHEAD", "3"))
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_sentences(text, min_chars=AUDIO_MIN_CHUNK_CHARS):
+    """
+    Split text into sentence chunks for incremental synthesis
+    """
+    chunks = []
+    pending = ""
+    for sentence in _SENTENCE_END.split(normalize_text(text)):
+        pending = f"{pending} {sentence}".strip()
+        if len(pending) >= min_chars:
+            chunks.append(pending)
+            pending = ""
+    if pending:
+        if chunks and len(pending) < min_chars:
+            chunks[-1] = f"{chunks[-1]} {pending}"
+        else:
+            chunks.append(pending)
+    return chunks
+
+
+class AudioJobManager:
+    def __init__(self, max_workers=AUDIO_WORKERS, job_ttl=AUDIO_JOB_TTL):
+        """
+        Runs speech synthesis off the request path.
+        Job ids are the content-addressed TTS cache keys, so submitting a text
+        that is already queued or running joins the existing job. Jobs can be
+        registered without starting synthesis; they start on first request.
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tts")
+        self.job_ttl = job_ttl
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.deduplicated = 0
+
+    def submit(self, text, lang="en", slow=False, start=True):
+        """
+        Register `text` and return its job id, or None for empty text.
+        With start=False synthesis is deferred until the job is first requested.
+        """
+        text = normalize_text(text or "")
+        if not text:
+            return None
+        job_id = tts_cache.make_key(text, lang, slow, engine=tts_backend.name)
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(job_id)
+            if job is None:
+                job = {"text": text, "lang": lang, "slow": slow, "future": None, "created": time.monotonic()}
+                self._jobs[job_id] = job
+            elif job["future"] is not None and not self._needs_rerun(job):
+                self.deduplicated += 1
+                return job_id
+            if start:
+                self._start(job_id, job)
+        return job_id
+
+    def _needs_rerun(self, job):
+        """
+        A job that failed, or finished with a failover clip that was kept out of
+        the cache, is synthesized again rather than joined
+        """
+        future = job["future"]
+        return future.done() and (future.exception() is not None or not job.get("cached"))
+
+    def _synthesize(self, job_id, job):
+        audio_bytes = synthesize_speech(job["text"], job["lang"], job["slow"])
+        job["cached"] = tts_cache.contains(job_id)
+        return audio_bytes
+
+    def _start(self, job_id, job):
+        # Caller holds self._lock
+        if job["future"] is None or self._needs_rerun(job):
+            job["cached"] = False
+            job["future"] = self._executor.submit(self._synthesize, job_id, job)
+            job["created"] = time.monotonic()
+            self.submitted += 1
+
+    def text_for(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+        return job["text"] if job else None
+
+    def get(self, job_id, wait=0):
+        """
+        Wait up to `wait` seconds for a job, starting it if it was deferred.
+        Returns (status, audio_bytes) with status 'ready', 'pending', 'failed' or 'unknown'.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job["future"] is None:
+                audio_bytes = tts_cache.get(job_id)
+                if audio_bytes:
+                    return "ready", audio_bytes
+                self._start(job_id, job)
+        if job is None:
+            # Finished jobs may have been pruned; their audio is still on disk
+            audio_bytes = tts_cache.get(job_id)
+            return ("ready", audio_bytes) if audio_bytes else ("unknown", None)
+        future = job["future"]
+        try:
+            audio_bytes = future.result(timeout=wait)
+        except FutureTimeout:
+            return "pending", None
+        except Exception as e:
+            print(f"ERROR in audio job {job_id}: {e}")
+            return "failed", None
+        return ("ready", audio_bytes) if audio_bytes else ("failed", None)
+
+    def stream(self, text, wait, lookahead=AUDIO_CHUNK_LOOKAHEAD, lang="en", slow=False):
+        """
+        Yield MP3 bytes for `text` sentence by sentence, in order.
+        Up to `lookahead` sentences are synthesized in parallel, so the first
+        chunk can play while later ones are still being generated.
+        """
+        sentences = iter(split_sentences(text))
+        queued = deque()
+        for sentence in sentences:
+            queued.append(self.submit(sentence, lang, slow))
+            if len(queued) >= lookahead:
+                break
+        while queued:
+            job_id = queued.popleft()
+            sentence = next(sentences, None)
+            if sentence:
+                queued.append(self.submit(sentence, lang, slow))
+            status, audio_bytes = self.get(job_id, wait=wait)
+            if status == "ready":
+                yield audio_bytes
+            else:
+                print(f"ERROR: audio chunk {job_id} {status}, skipping")
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.job_ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job["created"] < cutoff and (job["future"] is None or job["future"].done())
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def stats(self):
+        return {
+            "jobs": len(self._jobs),
+            "submitted": self.submitted,
+            "deduplicated": self.deduplicated,
+        }
+
+
+# Global audio job manager instance
+audio_jobs = AudioJobManager()
@@ -0,0 +1,103 @@
+# Bounded proctoring evidence for the AI Interview System
+import os
+import threading
+import time
+from datetime import datetime
+
+from lazy_imports import lazy_import
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+# Flagged frames kept per session; older ones are overwritten
+EVIDENCE_CAPACITY = int(os.getenv("EVIDENCE_CAPACITY", "12"))
+# Thumbnail (width, height) of each kept frame, grayscale
+EVIDENCE_SIZE = (
+    int(os.getenv("EVIDENCE_WIDTH", "128")),
+    int(os.getenv("EVIDENCE_HEIGHT", "96")),
+)
+
+
+def make_thumbnail(gray, size=EVIDENCE_SIZE):
+    """
+    Area-downscale a grayscale frame to an evidence thumbnail; returns raw uint8 bytes
+    """
+    return cv2.resize(gray, size, interpolation=cv2.INTER_AREA).tobytes()
+
+
+class EvidenceBuffer:
+    def __init__(self, capacity=EVIDENCE_CAPACITY, size=EVIDENCE_SIZE):
+        """
+        Fixed-size ring buffer of flagged frames for one session.
+        All thumbnails live in a single preallocated (capacity, height, width)
+        uint8 array, so a session never holds more than
+        capacity * width * height bytes of images however often it is flagged.
+        """
+        width, height = size
+        self.capacity = capacity
+        self.size = size
+        self.frames = np.zeros((capacity, height, width), np.uint8)
+        self.timestamps = np.zeros(capacity, np.float64)
+        self.has_image = np.zeros(capacity, bool)
+        self.reasons = [None] * capacity
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def add(self, thumbnail, reason, timestamp=None):
+        """
+        Record a flagged frame. `thumbnail` is make_thumbnail() output, or None
+        if the frame itself is unavailable (the reason is still kept).
+        """
+        with self._lock:
+            slot = self.total % self.capacity
+            width, height = self.size
+            if thumbnail is not None and len(thumbnail) == width * height:
+                self.frames[slot] = np.frombuffer(thumbnail, np.uint8).reshape(height, width)
+                self.has_image[slot] = True
+            else:
+                self.frames[slot] = 0
+                self.has_image[slot] = False
+            self.timestamps[slot] = time.time() if timestamp is None else timestamp
+            self.reasons[slot] = reason
+            self.total += 1
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    @property
+    def dropped(self):
+        return max(0, self.total - self.capacity)
+
+    @property
+    def nbytes(self):
+        return self.frames.nbytes + self.timestamps.nbytes + self.has_image.nbytes
+
+    def entries(self):
+        """
+        Kept frames, oldest first, as (timestamp, reason, thumbnail array or None)
+        """
+        with self._lock:
+            start = self.total - len(self)
+            entries = []
+            for index in range(start, self.total):
+                slot = index % self.capacity
+                frame = self.frames[slot].copy() if self.has_image[slot] else None
+                entries.append((float(self.timestamps[slot]), self.reasons[slot], frame))
+            return entries
+
+    def to_report(self):
+        """
+        Entries ready for the PDF report: {'time', 'reason', 'jpeg'} dicts, oldest first
+        """
+        report = []
+        for timestamp, reason, frame in self.entries():
+            jpeg = None
+            if frame is not None:
+                ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+                jpeg = buffer.tobytes() if ok else None
+            report.append({
+                "time": datetime.fromtimestamp(timestamp).strftime('%H:%M:%S'),
+                "reason": reason,
+                "jpeg": jpeg,
+            })
+        return report
@@ -0,0 +1,203 @@
+# Face detection benchmark for the AI Interview System
+#
+# Times each stage of FaceDetector on the deterministic synthetic corpus and
+# reports single-core frames/sec with p50/p99 latency per stage and resolution:
+#
+#     python face_benchmark.py --json face_bench.json
+#     python face_benchmark.py --compare face_bench.json   # exit 1 on regressions
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from face_detection import FaceDetector, decode_frame
+from synthetic_frames import EXPECTED, KINDS, RESOLUTIONS, build_corpus, encode_jpeg, face_enters_sequence
+
+# A stage regresses when its p50 grows by more than this fraction over the baseline
+DEFAULT_TOLERANCE = 0.25
+
+
+def _stages(detector):
+    """
+    Stage name -> (setup(entry) -> state, run(state), kinds or None for all).
+    Setup work is not timed; `run` is.
+    """
+    def decoded(entry):
+        return decode_frame(entry["jpeg"])
+
+    def tracked(entry):
+        # A primed track, as for a candidate sitting still in front of the camera
+        frame = decode_frame(entry["jpeg"])
+        track = {}
+        detector.detect_faces(frame, track, mode="fast")
+        return frame, track
+
+    return {
+        "decode": (lambda entry: entry["jpeg"], decode_frame, None),
+        "detect_full": (decoded, lambda frame: detector.detect_faces(frame, mode="full"), None),
+        "detect_fast": (decoded, lambda frame: detector.detect_faces(frame, {}, mode="fast"), None),
+        # The common case: one candidate, one steady face
+        "face_full": (decoded, lambda frame: detector.detect_faces(frame, mode="full"), ["face"]),
+        "face_tracked": (tracked, lambda state: detector.detect_faces(state[0], state[1], mode="fast"), ["face"]),
+        "quality_exact": (decoded, lambda frame: detector.analyze_quality(frame, mode="exact"), None),
+        "quality_fast": (decoded, lambda frame: detector.analyze_quality(frame, mode="fast"), None),
+        "pipeline": (lambda entry: entry["jpeg"], lambda jpeg: detector.analyze_frame(jpeg), None),
+        "pipeline_steady": (lambda entry: (entry["jpeg"], {}), lambda state: detector.analyze_frame(state[0], state[1]), None),
+    }
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def summarize(samples):
+    mean = sum(samples) / len(samples)
+    return {
+        "frames": len(samples),
+        "mean_ms": mean * 1000,
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "fps_per_core": (1.0 / mean) if mean else None,
+    }
+
+
+def check_detections(detector, corpus):
+    """
+    Face counts that differ from the corpus expectations, in either detection mode
+    """
+    misses = []
+    for entry in corpus:
+        expected = EXPECTED[entry["kind"]].get("face_count")
+        frame = decode_frame(entry["jpeg"])
+        for mode in ("full", "fast"):
+            count = detector.detect_faces(frame, {}, mode=mode)["face_count"]
+            if expected is not None and count != expected:
+                misses.append(f"{entry['kind']} {entry['width']}x{entry['height']} seed {entry['seed']} "
+                              f"{mode}: {count} faces, expected {expected}")
+    return misses
+
+
+def check_face_enters(detector, resolutions=RESOLUTIONS):
+    """
+    Feed a tracked session a steady single face, then a second face coming into
+    view, through the skip/ROI pipeline. Any two-face frame reported with one
+    face is a miss: skipping or tracking hid the newcomer.
+    """
+    misses = []
+    for width, height in resolutions:
+        track = {}
+        for index, (expected, image) in enumerate(face_enters_sequence(width, height)):
+            analysis = detector.analyze_frame(encode_jpeg(image), track)
+            count = analysis["face_result"]["face_count"]
+            if expected == 2 and count != expected:
+                misses.append(f"face_enters {width}x{height} frame {index}: {count} faces, expected {expected}"
+                              f"{' (skipped)' if analysis['skipped'] else ''}")
+    return misses
+
+
+def run(resolutions=RESOLUTIONS, kinds=KINDS, variants=3, repeat=5, stages=None):
+    """
+    Benchmark every stage at every resolution.
+    Returns {stage: {"WxH": summary}}.
+    """
+    detector = FaceDetector()
+    # Load the cascade and warm caches outside the timed loop
+    detector.face_cascade
+    all_stages = _stages(detector)
+    results = {}
+    for width, height in resolutions:
+        corpus = build_corpus(resolutions=[(width, height)], kinds=kinds, variants=variants)
+        for name, (setup, step, stage_kinds) in all_stages.items():
+            if stages and name not in stages:
+                continue
+            states = [setup(entry) for entry in corpus if not stage_kinds or entry["kind"] in stage_kinds]
+            if not states:
+                continue
+            step(states[0])
+            samples = []
+            for _ in range(repeat):
+                for state in states:
+                    started = time.perf_counter()
+                    step(state)
+                    samples.append(time.perf_counter() - started)
+            results.setdefault(name, {})[f"{width}x{height}"] = summarize(samples)
+    return results
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Stages/resolutions whose p50 got more than `tolerance` slower than the baseline
+    """
+    regressions = []
+    for stage, by_resolution in results.items():
+        for resolution, summary in by_resolution.items():
+            before = baseline.get(stage, {}).get(resolution)
+            if not before or not before.get("p50_ms"):
+                continue
+            change = summary["p50_ms"] / before["p50_ms"] - 1
+            if change > tolerance:
+                regressions.append(f"{stage} {resolution}: p50 {before['p50_ms']:.2f} -> {summary['p50_ms']:.2f} ms (+{change:.0%})")
+    return regressions
+
+
+def print_table(results):
+    print(f"{'stage':<16} {'resolution':<11} {'p50 ms':>8} {'p99 ms':>8} {'fps/core':>9}")
+    for stage, by_resolution in results.items():
+        for resolution, summary in by_resolution.items():
+            print(f"{stage:<16} {resolution:<11} {summary['p50_ms']:>8.2f} {summary['p99_ms']:>8.2f} {summary['fps_per_core']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FaceDetector stages on synthetic frames")
+    parser.add_argument("--resolutions", nargs="*", default=[f"{w}x{h}" for w, h in RESOLUTIONS], help="e.g. 640x480")
+    parser.add_argument("--stages", nargs="*", help="only run these stages")
+    parser.add_argument("--variants", type=int, default=3, help="frames per kind and resolution")
+    parser.add_argument("--repeat", type=int, default=5, help="passes over the corpus per stage")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    import cv2
+    # Per-core numbers: keep OpenCV from spreading one frame over every core
+    cv2.setNumThreads(1)
+
+    resolutions = [tuple(int(v) for v in r.lower().split("x")) for r in args.resolutions]
+    misses = check_detections(FaceDetector(), build_corpus(resolutions=resolutions, variants=args.variants))
+    misses += check_face_enters(FaceDetector(), resolutions)
+    for miss in misses:
+        print(f"DETECTION MISMATCH {miss}")
+
+    results = run(resolutions, variants=args.variants, repeat=args.repeat, stages=args.stages)
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "python": sys.version.split()[0],
+                "opencv": cv2.__version__,
+                "machine": platform.machine(),
+                "cpu_count": os.cpu_count(),
+                "timestamp": time.time(),
+                "detection_mismatches": misses,
+                "results": results,
+            }, f, indent=2)
+        print(f"Results written to {args.json}")
+
+    failed = bool(misses)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        failed = failed or bool(regressions)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,67 +1,262 @@
-import cv2
-import numpy as np
 import base64
+import os
+import threading
+import time
 from io import BytesIO
 
+from evidence import make_thumbnail
+from lazy_imports import lazy_import
+
+# OpenCV and numpy load on the first frame instead of at server startup
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+# JPEG frames can be decoded at 1/2, 1/4 or 1/8 scale by libjpeg itself.
+# 1 keeps full resolution, which is what the quality thresholds were tuned on.
+FACE_DECODE_REDUCTION = int(os.getenv("FACE_DECODE_REDUCTION", "1"))
+# "fast" runs the cascade on a downscaled frame around the last known face;
+# "full" scans every full-resolution frame
+FACE_DETECT_MODE = os.getenv("FACE_DETECT_MODE", "fast").lower()
+# Frames wider than this are downscaled before detection in fast mode
+FACE_DETECT_WIDTH = int(os.getenv("FACE_DETECT_WIDTH", "320"))
+# Search region around the last face, as a fraction of its size on each side
+FACE_ROI_PADDING = float(os.getenv("FACE_ROI_PADDING", "0.5"))
+# Force a full-frame scan after this many frames (ROI-tracked or skipped) so new faces are noticed
+FACE_FULL_SCAN_EVERY = int(os.getenv("FACE_FULL_SCAN_EVERY", "5"))
+# ...or after this many seconds, whichever comes first, so a slower sampling
+# cadence does not stretch the time a new face can go unnoticed
+FACE_FULL_SCAN_SECONDS = float(os.getenv("FACE_FULL_SCAN_SECONDS", "10"))
+# Frames whose thumbnail cells all differ from the last analyzed one by less than
+# this (0-255 scale) reuse its results; 0 analyzes every frame. A per-cell maximum
+# rather than a mean, so a face entering one side of the frame is not averaged away.
+FACE_SKIP_THRESHOLD = float(os.getenv("FACE_SKIP_THRESHOLD", "12"))
+# Analyze at least every Nth frame even if nothing seems to change, with a full-frame scan
+FACE_RECHECK_EVERY = int(os.getenv("FACE_RECHECK_EVERY", "5"))
+# ...and at least this often in seconds
+FACE_RECHECK_SECONDS = float(os.getenv("FACE_RECHECK_SECONDS", "10"))
+# Side of the square thumbnail used for change detection
+CHANGE_THUMB_SIZE = 16
+# "fast" measures quality on a small fixed thumbnail with integer math;
+# "exact" uses the full-resolution float64 Laplacian
+FACE_QUALITY_MODE = os.getenv("FACE_QUALITY_MODE", "fast").lower()
+# Thumbnail (width, height) for fast quality analysis; the blur threshold holds at this size
+QUALITY_THUMB_SIZE = (160, 120)
+# Face size limits, in original pixels
+MIN_FACE_SIZE = 30
+MAX_FACE_SIZE = 300
+
+_DECODE_FLAGS = {
+    1: "IMREAD_GRAYSCALE",
+    2: "IMREAD_REDUCED_GRAYSCALE_2",
+    4: "IMREAD_REDUCED_GRAYSCALE_4",
+    8: "IMREAD_REDUCED_GRAYSCALE_8",
+}
+
+
+class Frame:
+    def __init__(self, gray, scale=1):
+        """
+        A decoded camera frame shared by every analyzer.
+        `gray` is the single-channel image as decoded; `scale` is how many
+        original pixels one decoded pixel covers, used to map coordinates back.
+        """
+        self.gray = gray
+        self.scale = scale
+        self.height = gray.shape[0] * scale
+        self.width = gray.shape[1] * scale
+
+
+def decode_image_data(image):
+    """
+    Return the encoded image bytes of a base64 (optionally data-URL) string;
+    bytes are passed through unchanged
+    """
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return image
+    return base64.b64decode(image.split(',')[1] if ',' in image else image)
+
+
+def decode_frame(image, reduction=FACE_DECODE_REDUCTION):
+    """
+    Decode a JPEG/PNG (raw bytes or base64) straight to grayscale,
+    optionally at reduced scale. Returns a Frame, or None if it cannot be decoded.
+    """
+    nparr = np.frombuffer(decode_image_data(image), np.uint8)
+    if nparr.size == 0:
+        return None
+    if reduction not in _DECODE_FLAGS:
+        reduction = 1
+    gray = cv2.imdecode(nparr, getattr(cv2, _DECODE_FLAGS[reduction]))
+    if gray is None:
+        return None
+    return Frame(gray, scale=reduction)
+
+
+def is_suspicious(face_result, quality_result):
+    """
+    Whether a frame could count toward a cheating strike
+    """
+    return bool(
+        face_result.get('no_faces') or face_result.get('multiple_faces')
+        or quality_result.get('is_covered') or quality_result.get('is_too_dark')
+    )
+
+
+def change_thumbnail(frame):
+    """
+    Tiny area-averaged thumbnail of a frame for cheap change detection
+    """
+    return cv2.resize(frame.gray, (CHANGE_THUMB_SIZE, CHANGE_THUMB_SIZE), interpolation=cv2.INTER_AREA)
+
+
 class FaceDetector:
     def __init__(self):
-        # Load OpenCV's pre-trained face detector
-        self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-        
-    def detect_faces_from_base64(self, image_base64):
+        self._face_cascade = None
+        self._cascade_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.roi_detections = 0
+        self.full_scans = 0
+        # Scratch buffers for fast quality analysis, one set per thread
+        self._scratch = threading.local()
+
+    @property
+    def face_cascade(self):
+        """
+        OpenCV's pre-trained face detector, loaded on first use
+        """
+        if self._face_cascade is None:
+            with self._cascade_lock:
+                if self._face_cascade is None:
+                    self._face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+        return self._face_cascade
+
+    def analyze_frame(self, image, track=None, evidence=False):
         """
-        Detect faces from base64 encoded image
+        Decode a frame (raw bytes or base64) once and run every analyzer on it.
+        `track` is the per-session tracking state passed to detect_faces. With a
+        track, a frame that barely differs from the last analyzed one reuses its
+        results instead of running the cascade and quality analysis again.
+        With evidence=True, frames that could be flagged also carry a small
+        grayscale thumbnail for the session's evidence buffer.
+        Returns: {
+            'image_processed': bool,
+            'face_result': dict from detect_faces,
+            'quality_result': dict from analyze_quality,
+            'skipped': bool (results reused from an earlier frame),
+            'evidence': thumbnail bytes (only for suspicious frames with evidence=True),
+            'error': str (only if the frame could not be processed)
+        }
+        """
+        try:
+            frame = decode_frame(image)
+        except Exception as e:
+            return {'image_processed': False, 'error': str(e)}
+        if frame is None:
+            return {'image_processed': False, 'error': 'Could not decode image'}
+
+        thumb = None
+        skipped = False
+        if track is not None and FACE_SKIP_THRESHOLD > 0:
+            thumb = change_thumbnail(frame)
+            change = self._change(thumb, track)
+            if change is not None:
+                if self._recheck_due(track) or self._changed_outside_face(change, frame, track):
+                    # The ROI search can only find the tracked face; a periodic recheck
+                    # or a change elsewhere in the picture needs the whole frame scanned
+                    track['roi_frames'] = FACE_FULL_SCAN_EVERY
+                elif change.max() < FACE_SKIP_THRESHOLD:
+                    track['skipped_frames'] = track.get('skipped_frames', 0) + 1
+                    # Skipped frames still count toward the periodic full scan
+                    track['roi_frames'] = track.get('roi_frames', 0) + 1
+                    face_result, quality_result = track['last_results']
+                    skipped = True
+
+        if not skipped:
+            face_result = self.detect_faces(frame, track)
+            quality_result = self.analyze_quality(frame)
+            if thumb is not None:
+                track['thumb'] = thumb.tobytes()
+                track['last_results'] = (face_result, quality_result)
+                track['skipped_frames'] = 0
+                track['analyzed_at'] = time.time()
+
+        result = {
+            'image_processed': True,
+            'face_result': face_result,
+            'quality_result': quality_result,
+            'skipped': skipped,
+        }
+        if evidence and is_suspicious(face_result, quality_result):
+            result['evidence'] = make_thumbnail(frame.gray)
+        return result
+
+    def _change(self, thumb, track):
+        """
+        Per-cell absolute difference from the last analyzed frame's thumbnail,
+        or None if there are no results to reuse
+        """
+        previous = track.get('thumb')
+        if previous is None or 'last_results' not in track:
+            return None
+        previous = np.frombuffer(previous, np.uint8).reshape(thumb.shape)
+        return cv2.absdiff(thumb, previous)
+
+    def _recheck_due(self, track):
+        return (track.get('skipped_frames', 0) >= FACE_RECHECK_EVERY - 1
+                or time.time() - track.get('analyzed_at', 0) >= FACE_RECHECK_SECONDS)
+
+    def _full_scan_due(self, track):
+        return (track.get('roi_frames', 0) >= FACE_FULL_SCAN_EVERY
+                or time.time() - track.get('full_scan_at', 0) >= FACE_FULL_SCAN_SECONDS)
+
+    def _changed_outside_face(self, change, frame, track):
+        """
+        Whether the picture changed away from the tracked face (plus its ROI
+        padding), e.g. because someone else came into view
+        """
+        last_face = track.get('last_face')
+        if not last_face:
+            return False
+        x, y, w, h = last_face
+        pad = FACE_ROI_PADDING * max(w, h)
+        cells_x = CHANGE_THUMB_SIZE / frame.width
+        cells_y = CHANGE_THUMB_SIZE / frame.height
+        outside = change.copy()
+        outside[max(0, int((y - pad) * cells_y)):int(np.ceil((y + h + pad) * cells_y)),
+                max(0, int((x - pad) * cells_x)):int(np.ceil((x + w + pad) * cells_x))] = 0
+        return outside.max() >= FACE_SKIP_THRESHOLD
+
+    def detect_faces(self, frame, track=None, mode=None):
+        """
+        Detect faces in a decoded Frame.
+        `track` is a dict kept per session (e.g. session['face_track']); in fast
+        mode it remembers the last face so the next frame only searches near it.
         Returns: {
             'faces_detected': bool,
             'face_count': int,
-            'face_locations': list of (x, y, w, h),
-            'image_processed': bool
+            'face_locations': list of (x, y, w, h) in original image coordinates,
+            'image_processed': bool,
+            'search': 'roi' or 'full'
         }
         """
         try:
-            # Decode base64 image
-            image_data = base64.b64decode(image_base64.split(',')[1] if ',' in image_base64 else image_base64)
-            nparr = np.frombuffer(image_data, np.uint8)
-            image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            
-            if image is None:
-                return {
-                    'faces_detected': False,
-                    'face_count': 0,
-                    'face_locations': [],
-                    'image_processed': False,
-                    'error': 'Could not decode image'
-                }
-            
-            # Convert to grayscale for face detection
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            
-            # Detect faces
-            faces = self.face_cascade.detectMultiScale(
-                gray,
-                scaleFactor=1.1,
-                minNeighbors=5,
-                minSize=(30, 30),
-                maxSize=(300, 300)
-            )
-            
+            if (mode or FACE_DETECT_MODE) == "fast":
+                faces, search = self._detect_fast(frame, {} if track is None else track)
+            else:
+                faces, search = self._detect_full_resolution(frame), "full"
+
             face_count = len(faces)
-            faces_detected = face_count > 0
-            
-            # Draw rectangles around detected faces (for debugging)
-            result_image = image.copy()
-            for (x, y, w, h) in faces:
-                cv2.rectangle(result_image, (x, y), (x+w, y+h), (0, 255, 0), 2)
-            
+
             return {
-                'faces_detected': faces_detected,
+                'faces_detected': face_count > 0,
                 'face_count': face_count,
-                'face_locations': [(int(x), int(y), int(w), int(h)) for x, y, w, h in faces],
+                'face_locations': faces,
                 'image_processed': True,
                 'multiple_faces': face_count > 1,
-                'no_faces': face_count == 0
+                'no_faces': face_count == 0,
+                'search': search
             }
-            
+
         except Exception as e:
             return {
                 'faces_detected': False,
@@ -70,8 +265,74 @@ class FaceDetector:
                 'image_processed': False,
                 'error': str(e)
             }
-    
-    def analyze_frame_quality(self, image_base64):
+
+    def _cascade(self, gray, scale, scale_factor=1.1, min_size=MIN_FACE_SIZE, max_size=MAX_FACE_SIZE):
+        """
+        Run the cascade on `gray`, where one pixel covers `scale` original pixels.
+        Size limits are given in original pixels; boxes come back in `gray` pixels.
+        """
+        min_side = max(1, int(min_size / scale))
+        max_side = max(min_side + 1, int(max_size / scale))
+        return self.face_cascade.detectMultiScale(
+            gray,
+            scaleFactor=scale_factor,
+            minNeighbors=5,
+            minSize=(min_side, min_side),
+            maxSize=(max_side, max_side)
+        )
+
+    def _detect_full_resolution(self, frame):
+        scale = frame.scale
+        faces = self._cascade(frame.gray, scale)
+        return [(int(x * scale), int(y * scale), int(w * scale), int(h * scale)) for x, y, w, h in faces]
+
+    def _detect_fast(self, frame, track):
+        """
+        Downscale, then search around the last known face; fall back to a
+        full-frame scan when there is no face to track, the ROI search does not
+        find exactly one face, or FACE_FULL_SCAN_EVERY frames or
+        FACE_FULL_SCAN_SECONDS have passed since the last full scan.
+        """
+        gray = frame.gray
+        height, width = gray.shape[:2]
+        shrink = 1.0
+        if width > FACE_DETECT_WIDTH:
+            shrink = width / FACE_DETECT_WIDTH
+            gray = cv2.resize(gray, (FACE_DETECT_WIDTH, max(1, int(round(height / shrink)))), interpolation=cv2.INTER_AREA)
+            height, width = gray.shape[:2]
+        # Original pixels per detection pixel
+        scale = frame.scale * shrink
+
+        last_face = track.get('last_face')
+        if last_face and not self._full_scan_due(track):
+            x, y, w, h = (v / scale for v in last_face)
+            pad = FACE_ROI_PADDING * max(w, h)
+            x0, y0 = max(0, int(x - pad)), max(0, int(y - pad))
+            x1, y1 = min(width, int(x + w + pad)), min(height, int(y + h + pad))
+            if x1 > x0 and y1 > y0:
+                # The face should stay about the same size between samples
+                size = max(last_face[2], last_face[3])
+                faces = self._cascade(gray[y0:y1, x0:x1], scale, scale_factor=1.2,
+                                      min_size=max(MIN_FACE_SIZE, size * 0.6),
+                                      max_size=min(MAX_FACE_SIZE, size * 1.6))
+                if len(faces) == 1:
+                    fx, fy, fw, fh = faces[0]
+                    face = (int((fx + x0) * scale), int((fy + y0) * scale), int(fw * scale), int(fh * scale))
+                    track['last_face'] = face
+                    track['roi_frames'] = track.get('roi_frames', 0) + 1
+                    with self._stats_lock:
+                        self.roi_detections += 1
+                    return [face], "roi"
+
+        faces = [(int(x * scale), int(y * scale), int(w * scale), int(h * scale)) for x, y, w, h in self._cascade(gray, scale)]
+        track['last_face'] = faces[0] if len(faces) == 1 else None
+        track['roi_frames'] = 0
+        track['full_scan_at'] = time.time()
+        with self._stats_lock:
+            self.full_scans += 1
+        return faces, "full"
+
+    def analyze_quality(self, frame, mode=None):
         """
         Analyze frame quality for cheat detection
         Returns: {
@@ -83,28 +344,16 @@ class FaceDetector:
         }
         """
         try:
-            # Decode base64 image
-            image_data = base64.b64decode(image_base64.split(',')[1] if ',' in image_base64 else image_base64)
-            nparr = np.frombuffer(image_data, np.uint8)
-            image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            
-            if image is None:
-                return {'error': 'Could not decode image'}
-            
-            # Convert to grayscale
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            
-            # Calculate brightness
-            brightness = np.mean(gray)
-            
-            # Calculate blur score (Laplacian variance)
-            blur_score = cv2.Laplacian(gray, cv2.CV_64F).var()
-            
+            if (mode or FACE_QUALITY_MODE) == "fast":
+                brightness, blur_score = self._quality_fast(frame.gray)
+            else:
+                brightness, blur_score = self._quality_exact(frame.gray)
+
             # Determine conditions - more lenient thresholds
             is_too_dark = brightness < 15  # Was 30, now more lenient
             is_too_bright = brightness > 240  # Was 200, now more lenient
             is_covered = brightness < 10 or blur_score < 50  # Was 20/100, now more lenient
-            
+
             return {
                 'brightness': float(brightness),
                 'blur_score': float(blur_score),
@@ -113,9 +362,89 @@ class FaceDetector:
                 'is_too_bright': bool(is_too_bright),
                 'quality_good': bool(not (is_too_dark or is_too_bright or is_covered))
             }
-            
+
+        except Exception as e:
+            return {'error': str(e)}
+
+    def _quality_exact(self, gray):
+        # Calculate brightness
+        brightness = np.mean(gray)
+
+        # Calculate blur score (Laplacian variance)
+        blur_score = cv2.Laplacian(gray, cv2.CV_64F).var()
+        return brightness, blur_score
+
+    def _quality_buffers(self):
+        scratch = self._scratch
+        if not hasattr(scratch, 'thumb'):
+            width, height = QUALITY_THUMB_SIZE
+            scratch.thumb = np.empty((height, width), np.uint8)
+            scratch.laplacian = np.empty((height, width), np.int16)
+            scratch.levels = np.arange(256, dtype=np.float32)
+        return scratch
+
+    def _quality_fast(self, gray):
+        """
+        Brightness from the histogram of an area-averaged thumbnail (which keeps
+        the mean of the full frame) and blur from a 16-bit Laplacian of the same
+        thumbnail, all in preallocated buffers. Detail concentrates when a frame
+        is shrunk while sensor noise averages out, so real scenes score at
+        least as high as at full size and flat covered frames stay low.
+        """
+        buffers = self._quality_buffers()
+        width, height = QUALITY_THUMB_SIZE
+        if gray.shape[1] < width or gray.shape[0] < height:
+            # Already smaller than the thumbnail (e.g. a reduced decode); don't upsample
+            return self._quality_exact(gray)
+        thumb = cv2.resize(gray, QUALITY_THUMB_SIZE, dst=buffers.thumb, interpolation=cv2.INTER_AREA)
+        hist = cv2.calcHist([thumb], [0], None, [256], [0, 256])
+        brightness = float(hist.ravel() @ buffers.levels) / thumb.size
+        laplacian = cv2.Laplacian(thumb, cv2.CV_16S, dst=buffers.laplacian)
+        _, stddev = cv2.meanStdDev(laplacian)
+        return brightness, float(stddev[0, 0]) ** 2
+
+    def detect_faces_from_base64(self, image_base64):
+        """
+        Detect faces from base64 encoded image.
+        Prefer analyze_frame when the quality result is needed too.
+        """
+        try:
+            frame = decode_frame(image_base64)
+        except Exception as e:
+            frame, error = None, str(e)
+        else:
+            error = 'Could not decode image'
+        if frame is None:
+            return {
+                'faces_detected': False,
+                'face_count': 0,
+                'face_locations': [],
+                'image_processed': False,
+                'error': error
+            }
+        return self.detect_faces(frame)
+
+    def analyze_frame_quality(self, image_base64):
+        """
+        Analyze frame quality of a base64 encoded image.
+        Prefer analyze_frame when faces are detected too.
+        """
+        try:
+            frame = decode_frame(image_base64)
         except Exception as e:
             return {'error': str(e)}
+        if frame is None:
+            return {'error': 'Could not decode image'}
+        return self.analyze_quality(frame)
+
+    def stats(self):
+        total = self.roi_detections + self.full_scans
+        return {
+            "mode": FACE_DETECT_MODE,
+            "roi_detections": self.roi_detections,
+            "full_scans": self.full_scans,
+            "roi_rate": (self.roi_detections / total) if total else 0.0,
+        }
 
 # Global face detector instance
 face_detector = FaceDetector()
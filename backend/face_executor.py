@@ -0,0 +1,205 @@
+# Process-pool face analysis for the AI Interview System
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from face_detection import FaceDetector, decode_image_data
+
+# Worker processes for OpenCV analysis; 0 runs it inline on the request thread
+FACE_WORKERS = int(os.getenv("FACE_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Frames queued or running at once across all sessions; beyond this requests are rejected
+FACE_QUEUE_SIZE = int(os.getenv("FACE_QUEUE_SIZE", str(max(1, FACE_WORKERS) * 4)))
+# How long a request waits for a queue slot before it is turned away
+FACE_QUEUE_WAIT = float(os.getenv("FACE_QUEUE_WAIT", "0.5"))
+FACE_ANALYSIS_TIMEOUT = float(os.getenv("FACE_ANALYSIS_TIMEOUT", "10"))
+
+
+class FaceAnalysisBusy(RuntimeError):
+    """Raised when the face analysis queue is full"""
+
+
+# Per-process detector, each with its own CascadeClassifier
+_worker_detector = None
+
+
+def _init_worker():
+    global _worker_detector
+    _worker_detector = FaceDetector()
+    # Load the cascade now so the first frame does not pay for it
+    _worker_detector.face_cascade
+
+
+def _analyze_in_worker(image_data, track, detector=None):
+    """
+    Runs in a worker process. The session's tracking state travels with the
+    frame and comes back updated, since workers share no memory with the server.
+    """
+    analysis = (detector or _worker_detector).analyze_frame(image_data, track, evidence=True)
+    return analysis, track
+
+
+def _analyze_batch_in_worker(images, track, detector=None):
+    """
+    Analyze a session's frames in order in one worker so tracking carries over
+    """
+    detector = detector or _worker_detector
+    analyses = [detector.analyze_frame(image_data, track, evidence=True) for image_data in images]
+    return analyses, track
+
+
+def _encoded_bytes(image):
+    try:
+        return bytes(decode_image_data(image))
+    except Exception:
+        # Undecodable input; analyze_frame reports it as an unprocessed frame
+        return b""
+
+
+class FaceAnalysisExecutor:
+    def __init__(self, workers=FACE_WORKERS, queue_size=FACE_QUEUE_SIZE, queue_wait=FACE_QUEUE_WAIT):
+        """
+        Runs CPU-bound face analysis in worker processes so it scales across
+        cores and never holds the GIL that the answer/LLM endpoints need.
+        Frames are sent as their compressed JPEG bytes, which are much smaller
+        than the decoded image. A semaphore bounds frames in flight; when it is
+        exhausted callers get FaceAnalysisBusy instead of queueing without limit.
+        """
+        self.workers = workers
+        self.queue_size = queue_size
+        self.queue_wait = queue_wait
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._inline_detector = FaceDetector() if workers <= 0 else None
+        self._stats_lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.roi_detections = 0
+        self.full_scans = 0
+        self.skipped = 0
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    # spawn, not fork: the server process runs threads and holds locks
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_worker,
+                    )
+        return self._pool
+
+    def start(self):
+        """
+        Start the worker processes now instead of on the first frame
+        """
+        if self._inline_detector is not None:
+            self._inline_detector.face_cascade
+            return
+        pool = self._get_pool()
+        # Submitting one no-op per worker forces them all to spawn and initialize
+        for future in [pool.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+
+    def analyze(self, image, track=None, timeout=FACE_ANALYSIS_TIMEOUT):
+        """
+        Decode and analyze one frame (raw bytes or base64).
+        `track` is updated in place. Returns the FaceDetector.analyze_frame result.
+        Raises FaceAnalysisBusy if no queue slot frees up within queue_wait seconds.
+        """
+        analysis = self._run(_analyze_in_worker, _encoded_bytes(image), track, timeout)
+        self._record([analysis])
+        return analysis
+
+    def analyze_batch(self, images, track=None, timeout=FACE_ANALYSIS_TIMEOUT):
+        """
+        Analyze several frames of one session, oldest first, as a single task.
+        The batch takes one queue slot and one round trip to a worker.
+        Returns a list of analyze_frame results in input order.
+        """
+        analyses = self._run(_analyze_batch_in_worker, [_encoded_bytes(image) for image in images],
+                             track, timeout * max(1, len(images)))
+        self._record(analyses)
+        return analyses
+
+    def _run(self, worker_fn, payload, track, timeout):
+        if not self._slots.acquire(timeout=self.queue_wait):
+            with self._stats_lock:
+                self.rejected += 1
+            raise FaceAnalysisBusy("Face analysis queue is full")
+        with self._stats_lock:
+            self.in_flight += 1
+
+        if self._inline_detector is not None:
+            try:
+                result, _ = worker_fn(payload, {} if track is None else track, self._inline_detector)
+            finally:
+                self._release()
+            return result
+
+        try:
+            future = self._get_pool().submit(worker_fn, payload, dict(track or {}))
+        except Exception as e:
+            self._release()
+            if isinstance(e, BrokenProcessPool):
+                self._reset_pool()
+            raise
+        # The slot is held until the worker finishes, even if we stop waiting
+        future.add_done_callback(lambda _: self._release())
+        try:
+            result, new_track = future.result(timeout=timeout)
+        except FutureTimeout:
+            raise TimeoutError("Face analysis timed out")
+        except BrokenProcessPool:
+            self._reset_pool()
+            raise
+        if track is not None:
+            track.clear()
+            track.update(new_track)
+        return result
+
+    def _release(self):
+        with self._stats_lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def _reset_pool(self):
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _record(self, analyses):
+        with self._stats_lock:
+            for analysis in analyses:
+                search = (analysis.get('face_result') or {}).get('search')
+                self.completed += 1
+                if analysis.get('skipped'):
+                    self.skipped += 1
+                elif search == 'roi':
+                    self.roi_detections += 1
+                elif search == 'full':
+                    self.full_scans += 1
+
+    def stats(self):
+        scans = self.roi_detections + self.full_scans
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "roi_detections": self.roi_detections,
+            "full_scans": self.full_scans,
+            "roi_rate": (self.roi_detections / scans) if scans else 0.0,
+            "frames_skipped": self.skipped,
+            "skip_rate": (self.skipped / self.completed) if self.completed else 0.0,
+        }
+
+
+# Global face analysis executor instance
+face_executor = FaceAnalysisExecutor()
@@ -1,29 +1,33 @@
 import time
 import os
-import speech_recognition as sr
 try:
     import audioop
 except ImportError:
     audioop = None
-import base64
 import io
-from gtts import gTTS
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
 from datetime import datetime
 
 
-import google.generativeai as genai
-import os
+from lazy_imports import lazy_import
+from llm_client import llm_client
+from response_parser import parse_response, response_schema, missing_fields
+from transcript_summary import estimate_tokens
+from tts_cache import tts_cache, normalize_text
+from tts_backends import tts_backend
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# Configure Gemini API
-genai.configure(api_key=os.getenv("GEMINI_API_KEY", "your_gemini_api_key_here"))
+sr = lazy_import("speech_recognition")
+
+# Reports send the whole transcript, so give them more time than a single turn
+REPORT_TIMEOUT = float(os.getenv("GEMINI_REPORT_TIMEOUT", "60"))
+REPORT_DEADLINE = float(os.getenv("GEMINI_REPORT_DEADLINE", "120"))
+# Above this size the report prompt uses the rolling summary instead of the full transcript
+REPORT_TRANSCRIPT_TOKENS = int(os.getenv("REPORT_TRANSCRIPT_TOKENS", "3000"))
+REPORT_RECENT_LINES = int(os.getenv("REPORT_RECENT_LINES", "6"))
+# "json" uses Gemini's schema-constrained JSON output, "lines" the labeled-line format
+RESPONSE_MODE = os.getenv("INTERVIEWER_RESPONSE_MODE", "json").lower()
 
 def extract_text(run_output):
     if hasattr(run_output, "content"):
@@ -119,34 +123,88 @@ def wav_to_text(filename):
     except:
         return ""
 
-def speak_text(text):
+def synthesize_speech(text, lang="en", slow=False):
     """
-    Convert text to speech and return base64 encoded audio.
+    Convert text to audio bytes with the configured TTS backend, serving
+    repeated phrases from the audio cache.
+    Returns None for empty text.
     """
-    text = extract_text(text)
-    if not text.strip():
+    text = normalize_text(extract_text(text))
+    if not text:
         return None
 
-    try:
-        print(f"DEBUG: Attempting TTS for text: '{text[:50]}...'")
-        tts = gTTS(text=text, lang="en", slow=False)
-        fp = io.BytesIO()
-        tts.write_to_fp(fp)
-        fp.seek(0)
+    key = tts_cache.make_key(text, lang, slow, engine=tts_backend.name)
+    audio_bytes = tts_cache.get(key)
+    if audio_bytes is not None:
+        print(f"DEBUG: TTS cache hit for text: '{text[:50]}...'")
+        return audio_bytes
+
+    print(f"DEBUG: Attempting {tts_backend.name} TTS for text: '{text[:50]}...'")
+    audio_bytes, engine = tts_backend.synthesize_from(text, lang, slow)
+    if engine == tts_backend.primary:
+        tts_cache.put(key, audio_bytes)
+    else:
+        # Failover output (e.g. the silent stub) must not outlive the outage
+        print(f"DEBUG: not caching {engine} failover clip for text: '{text[:50]}...'")
+    return audio_bytes
+
+def transcript_for_prompt(session_data):
+    """
+    Transcript text for an LLM prompt.
+    Long interviews send the rolling summary plus the most recent turns instead
+    of the full transcript, keeping the prompt size roughly constant.
+    """
+    transcript = session_data.get('transcript', [])
+    full_text = chr(10).join(transcript)
+    summary = session_data.get('summary')
+    if not summary or estimate_tokens(full_text) <= REPORT_TRANSCRIPT_TOKENS:
+        return full_text
+    recent = chr(10).join(transcript[-REPORT_RECENT_LINES:])
+    return f"Summary of the interview so far:\n{summary}\n\nMost recent exchanges:\n{recent}"
+
+def build_evaluation_prompt(session_data):
+    """
+    Prompt for the end-of-interview evaluation
+    """
+    return f"""
+        Based on this interview transcript, provide a comprehensive evaluation:
         
-        audio_base64 = base64.b64encode(fp.read()).decode('utf-8')
-        print(f"DEBUG: TTS success, audio length: {len(audio_base64)}")
-        return audio_base64
-    except Exception as e:
-        print(f"ERROR in text-to-speech: {e}")
-        return None
+        Job Description: {session_data.get('jd', 'N/A')}
+        Experience: {session_data.get('experience', 'N/A')}
+        
+        Transcript:
+        {transcript_for_prompt(session_data)}
+        
+        Please provide:
+        1. Overall Assessment (1-10 scale)
+        2. Technical Skills Evaluation
+        3. Communication Skills
+        4. Problem-Solving Ability
+        5. Strengths
+        6. Areas for Improvement
+        7. Recommendation (Hire/Consider/Reject)
+        """
 
 
-def generate_pdf_report(session_data):
+def generate_evaluation(session_data):
     """
-    Generate a PDF report from interview session data.
-    Returns base64 encoded PDF.
+    Generate the AI evaluation text for an interview
     """
+    return report_agent(build_evaluation_prompt(session_data))
+
+def render_pdf_report(session_data, evaluation=None):
+    """
+    Render a PDF report from interview session data.
+    Pass `evaluation` to reuse an existing AI evaluation instead of generating one.
+    Returns the PDF bytes.
+    """
+    # reportlab is only needed once per interview, so load it here rather than at startup
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.lib import colors
+
     try:
         # Create a BytesIO buffer
         buffer = io.BytesIO()
@@ -206,32 +264,36 @@ def generate_pdf_report(session_data):
         
         story.append(Spacer(1, 20))
         
+        # Proctoring evidence: thumbnails of the most recent flagged frames
+        evidence = session_data.get('evidence') or []
+        if evidence:
+            story.append(Paragraph("Proctoring Evidence", styles['Heading2']))
+            story.append(Paragraph(
+                f"Strikes: {session_data.get('strikes', 0)}. The {len(evidence)} most recent flagged frames are shown.",
+                styles['Normal']
+            ))
+            story.append(Spacer(1, 6))
+            evidence_rows = [['Time', 'Reason', 'Frame']]
+            for item in evidence:
+                frame_cell = Image(io.BytesIO(item['jpeg']), width=1.6*inch, height=1.2*inch) if item.get('jpeg') else 'Not captured'
+                evidence_rows.append([item['time'], Paragraph(item['reason'] or '', styles['Normal']), frame_cell])
+            evidence_table = Table(evidence_rows, colWidths=[0.9*inch, 3.1*inch, 1.8*inch], repeatRows=1)
+            evidence_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black)
+            ]))
+            story.append(evidence_table)
+            story.append(Spacer(1, 20))
+        
         # AI Evaluation
         story.append(Paragraph("AI Evaluation", styles['Heading2']))
         
-        # Generate AI evaluation
-        evaluation_prompt = f"""
-        Based on this interview transcript, provide a comprehensive evaluation:
-        
-        Job Description: {session_data.get('jd', 'N/A')}
-        Experience: {session_data.get('experience', 'N/A')}
-        
-        Transcript:
-        {chr(10).join(transcript)}
-        
-        Please provide:
-        1. Overall Assessment (1-10 scale)
-        2. Technical Skills Evaluation
-        3. Communication Skills
-        4. Problem-Solving Ability
-        5. Strengths
-        6. Areas for Improvement
-        7. Recommendation (Hire/Consider/Reject)
-        """
-        
         try:
-            evaluation = interviewer_agent(evaluation_prompt)
-            evaluation_text = evaluation
+            # Generate AI evaluation unless the caller already has one
+            evaluation_text = evaluation if evaluation is not None else generate_evaluation(session_data)
             
             # Split evaluation into paragraphs
             for paragraph in evaluation_text.split('\n'):
@@ -244,12 +306,8 @@ def generate_pdf_report(session_data):
         # Build PDF
         doc.build(story)
         
-        # Get PDF bytes and encode
-        buffer.seek(0)
-        pdf_bytes = buffer.read()
-        pdf_base64 = base64.b64encode(pdf_bytes).decode('utf-8')
-        
-        return pdf_base64
+        # Get PDF bytes
+        return buffer.getvalue()
         
     except Exception as e:
         print(f"Error generating PDF: {e}")
@@ -257,18 +315,64 @@ def generate_pdf_report(session_data):
 
 
 
-def interviewer_agent(prompt):
+def interviewer_agent(prompt, timeout=None):
     """
     Generate interviewer response using Gemini API
     """
-    model = genai.GenerativeModel('gemini-2.5-flash')
-    response = model.generate_content(prompt)
-    return response.text
+    return llm_client.generate(prompt, timeout=timeout)
+
+def interviewer_agent_stream(prompt, timeout=None, required=None):
+    """
+    Stream interviewer response text chunks from Gemini API.
+    In JSON mode, `required` fields are enforced through the response schema.
+    """
+    if RESPONSE_MODE == "json" and required:
+        return llm_client.stream(prompt, timeout=timeout, generation_config=json_generation_config(required))
+    return llm_client.stream(prompt, timeout=timeout)
+
+def json_generation_config(required):
+    return {
+        "response_mime_type": "application/json",
+        "response_schema": response_schema(required),
+    }
+
+def repair_response(raw, required, timeout=None):
+    """
+    Single in-process repair attempt for a malformed structured response.
+    Returns the parsed parts of the repaired output.
+    """
+    repair_prompt = (
+        "Your previous reply did not match the required JSON format.\n"
+        f"Required fields: {', '.join(required)}\n"
+        f"Previous reply:\n{raw}\n\n"
+        "Return only the corrected JSON object, keeping the original wording where possible."
+    )
+    print(f"DEBUG: Repairing structured response, missing: {missing_fields(parse_response(raw or ''), required)}")
+    repaired = llm_client.generate(repair_prompt, timeout=timeout, generation_config=json_generation_config(required))
+    return parse_response(repaired)
+
+def structured_interviewer_agent(prompt, required, timeout=None):
+    """
+    Generate an interviewer response and parse it into its fields.
+    In JSON mode the output is schema-constrained and, if required fields are
+    still missing, repaired once in-process instead of failing the turn.
+    Returns (parts, raw_text).
+    """
+    if RESPONSE_MODE != "json":
+        raw = interviewer_agent(prompt, timeout=timeout)
+        return parse_response(raw or ""), raw
+
+    raw = llm_client.generate(prompt, timeout=timeout, generation_config=json_generation_config(required))
+    parts = parse_response(raw or "")
+    if missing_fields(parts, required):
+        repaired = repair_response(raw, required, timeout=timeout)
+        for field, value in repaired.items():
+            if value and not parts.get(field):
+                parts[field] = value
+    return parts, raw
 
-def report_agent(prompt):
+def report_agent(prompt, timeout=None):
     """
     Generate report using Gemini API
     """
-    model = genai.GenerativeModel('gemini-2.5-flash')
-    response = model.generate_content(prompt)
-    return response.text
+    return llm_client.generate(prompt, timeout=timeout or REPORT_TIMEOUT, deadline=REPORT_DEADLINE)
@@ -0,0 +1,57 @@
+# Deferred imports of heavy dependencies for the AI Interview System
+import importlib
+import importlib.util
+import sys
+import threading
+
+_lock = threading.Lock()
+
+# Heavy dependencies that load on first use; /api/health reports which are in memory
+HEAVY_MODULES = ["google.generativeai", "cv2", "numpy", "pygame", "speech_recognition", "reportlab.platypus"]
+
+
+def lazy_import(name):
+    """
+    Return module `name` without executing it yet.
+    The real import runs on first attribute access, so modules such as cv2,
+    numpy or pygame cost nothing until a request actually needs them.
+    A missing package still fails here, at import time of the caller.
+    """
+    with _lock:
+        module = sys.modules.get(name)
+        if module is not None:
+            return module
+        spec = importlib.util.find_spec(name)
+        if spec is None:
+            raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+        loader = importlib.util.LazyLoader(spec.loader)
+        spec.loader = loader
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        loader.exec_module(module)
+        return module
+
+
+def ensure_loaded(name):
+    """
+    Force a (possibly lazy) module to finish importing and return it
+    """
+    module = importlib.import_module(name)
+    # Any attribute access completes a pending lazy load
+    getattr(module, "__dict__")
+    return module
+
+
+def is_loaded(name):
+    """
+    Check whether a module has actually been executed, not just registered lazily
+    """
+    module = sys.modules.get(name)
+    return module is not None and not isinstance(module, importlib.util._LazyModule)
+
+
+def loaded_modules(names=HEAVY_MODULES):
+    """
+    {module: bool} for the given modules, e.g. to check what warm-up or traffic has loaded
+    """
+    return {name: is_loaded(name) for name in names}
@@ -0,0 +1,200 @@
+# Shared Gemini client for the AI Interview System
+import os
+import random
+import threading
+import time
+
+from dotenv import load_dotenv
+
+from lazy_imports import lazy_import
+from rate_limiter import TokenBucket
+
+load_dotenv()
+
+# google.generativeai pulls in grpc and protobuf; only load it when the first model is built
+genai = lazy_import("google.generativeai")
+
+DEFAULT_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+DEFAULT_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "30"))
+# Total time a call may spend queued for admission and retrying 429s
+DEFAULT_DEADLINE = float(os.getenv("GEMINI_DEADLINE", "60"))
+RETRY_BASE_DELAY = float(os.getenv("GEMINI_RETRY_BASE_DELAY", "1.0"))
+RETRY_MAX_DELAY = float(os.getenv("GEMINI_RETRY_MAX_DELAY", "16.0"))
+
+
+class LLMTimeoutError(TimeoutError):
+    """Raised when a call cannot be admitted or answered before its deadline"""
+
+
+def is_rate_limited(error):
+    """
+    Check whether a Gemini exception is a 429 / quota rejection
+    """
+    if getattr(error, "code", None) == 429 or type(error).__name__ in ("ResourceExhausted", "TooManyRequests"):
+        return True
+    message = str(error).lower()
+    return "429" in message or "resource exhausted" in message or "rate limit" in message
+
+
+class LLMClient:
+    def __init__(self, model_name=DEFAULT_MODEL, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 default_timeout=DEFAULT_TIMEOUT, default_deadline=DEFAULT_DEADLINE, limiter=None):
+        """
+        Process-wide Gemini client.
+        The GenerativeModel is built once on first use and reused so the underlying
+        transport (and its HTTP/gRPC connections) is shared by every request.
+        Every call is admitted through a shared token bucket and retried on 429s
+        with jittered exponential backoff until its deadline.
+        """
+        self.model_name = model_name
+        self.max_concurrency = max_concurrency
+        self.default_timeout = default_timeout
+        self.default_deadline = default_deadline
+        self.limiter = limiter or TokenBucket()
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._in_flight = 0
+        self._retries = 0
+        self._rejected = 0
+        self._stats_lock = threading.Lock()
+
+    def get_model(self):
+        """
+        Return the shared GenerativeModel, building it on first use
+        """
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    # Configure Gemini API
+                    genai.configure(api_key=os.getenv("GEMINI_API_KEY", "your_gemini_api_key_here"))
+                    self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+
+    def _admit(self, deadline):
+        """
+        Wait for a rate-limit token and a concurrency slot before `deadline`
+        """
+        if not self.limiter.acquire(deadline):
+            with self._stats_lock:
+                self._rejected += 1
+            raise LLMTimeoutError("Gemini request queue did not drain before the deadline")
+        if not self._slots.acquire(timeout=max(deadline - time.monotonic(), 0)):
+            with self._stats_lock:
+                self._rejected += 1
+            raise LLMTimeoutError("No free Gemini slot before the deadline")
+        with self._stats_lock:
+            self._in_flight += 1
+
+    def _release(self):
+        with self._stats_lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def _backoff(self, attempt, deadline, error):
+        """
+        Sleep before retrying a rate-limited call, or re-raise if out of time
+        """
+        delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)))
+        if time.monotonic() + delay >= deadline:
+            raise error
+        print(f"DEBUG: Gemini rate limited, retry {attempt + 1} in {delay:.2f}s")
+        with self._stats_lock:
+            self._retries += 1
+        time.sleep(delay)
+
+    def _request_options(self, base_options, timeout, deadline):
+        request_options = dict(base_options or {})
+        request_options.setdefault("timeout", max(min(timeout, deadline - time.monotonic()), 1.0))
+        return request_options
+
+    def generate(self, prompt, timeout=None, deadline=None, **kwargs):
+        """
+        Generate a completion for `prompt`.
+        `timeout` (seconds) bounds each model call; `deadline` (seconds) bounds the
+        whole call including queueing for admission and 429 retries.
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+        deadline = time.monotonic() + (self.default_deadline if deadline is None else deadline)
+        base_options = kwargs.pop("request_options", None)
+
+        attempt = 0
+        while True:
+            self._admit(deadline)
+            try:
+                response = self.get_model().generate_content(
+                    prompt, request_options=self._request_options(base_options, timeout, deadline), **kwargs
+                )
+                return response.text
+            except Exception as e:
+                if not is_rate_limited(e):
+                    raise
+                error = e
+            finally:
+                self._release()
+            self._backoff(attempt, deadline, error)
+            attempt += 1
+
+    def stream(self, prompt, timeout=None, deadline=None, **kwargs):
+        """
+        Generate a completion for `prompt`, yielding text chunks as they arrive.
+        The concurrency slot is held until the generator is exhausted or closed.
+        Rate-limited calls are only retried before any text has been yielded.
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+        deadline = time.monotonic() + (self.default_deadline if deadline is None else deadline)
+        base_options = kwargs.pop("request_options", None)
+
+        attempt = 0
+        while True:
+            self._admit(deadline)
+            yielded = False
+            try:
+                response = self.get_model().generate_content(
+                    prompt, stream=True,
+                    request_options=self._request_options(base_options, timeout, deadline), **kwargs
+                )
+                for chunk in response:
+                    try:
+                        text = chunk.text
+                    except ValueError:
+                        # Chunks without text parts (e.g. safety metadata)
+                        continue
+                    if text:
+                        yielded = True
+                        yield text
+                return
+            except Exception as e:
+                if yielded or not is_rate_limited(e):
+                    raise
+                error = e
+            finally:
+                self._release()
+            self._backoff(attempt, deadline, error)
+            attempt += 1
+
+    def queue_depth(self):
+        """
+        Number of calls waiting for admission
+        """
+        return self.limiter.queue_depth()
+
+    def stats(self):
+        """
+        Current client state for health/metrics endpoints
+        """
+        return {
+            "model": self.model_name,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "default_timeout": self.default_timeout,
+            "default_deadline": self.default_deadline,
+            "retries": self._retries,
+            "rejected": self._rejected,
+            "rate_limit": self.limiter.stats(),
+        }
+
+
+# Global LLM client instance
+llm_client = LLMClient()
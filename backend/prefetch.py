@@ -0,0 +1,93 @@
+# Speculative next-question prefetch for the AI Interview System
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from interview_logic import interviewer_agent
+
+PREFETCH_ENABLED = os.getenv("PREFETCH_NEXT_QUESTION", "false").lower() in ("1", "true", "yes")
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "4"))
+# How long an answer may wait for a draft that is still being generated
+PREFETCH_WAIT = float(os.getenv("PREFETCH_WAIT", "2.0"))
+
+
+class QuestionPrefetcher:
+    def __init__(self, max_workers=PREFETCH_WORKERS):
+        """
+        Generates a draft of the next question in the background while the
+        candidate is still answering the current one.
+        At most one draft is pending per session; drafts for a question number
+        other than the one being asked for are discarded.
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.scheduled = 0
+        self.used = 0
+        self.discarded = 0
+
+    def schedule(self, session_id, question_number, prompt):
+        """
+        Start generating the draft for `question_number`, replacing any older draft
+        """
+        future = self._executor.submit(interviewer_agent, prompt)
+        with self._lock:
+            previous = self._pending.pop(session_id, None)
+            self._pending[session_id] = {"question_number": question_number, "future": future}
+            self.scheduled += 1
+        if previous:
+            self._discard(previous)
+
+    def take(self, session_id, question_number, wait=PREFETCH_WAIT):
+        """
+        Return the raw draft completion for `question_number`, or None if there is
+        no usable draft within `wait` seconds
+        """
+        with self._lock:
+            entry = self._pending.pop(session_id, None)
+        if not entry:
+            return None
+        if entry["question_number"] != question_number:
+            self._discard(entry)
+            return None
+        try:
+            draft = entry["future"].result(timeout=wait)
+        except FutureTimeout:
+            self._discard(entry)
+            return None
+        except Exception as e:
+            print(f"DEBUG: Prefetch failed for session {session_id}: {e}")
+            with self._lock:
+                self.discarded += 1
+            return None
+        with self._lock:
+            self.used += 1
+        return draft
+
+    def cancel(self, session_id):
+        """
+        Drop any pending draft for a session that has ended
+        """
+        with self._lock:
+            entry = self._pending.pop(session_id, None)
+        if entry:
+            self._discard(entry)
+
+    def _discard(self, entry):
+        # Not-yet-started drafts are cancelled; running ones finish and are dropped
+        entry["future"].cancel()
+        with self._lock:
+            self.discarded += 1
+
+    def stats(self):
+        return {
+            "enabled_by_default": PREFETCH_ENABLED,
+            "pending": len(self._pending),
+            "scheduled": self.scheduled,
+            "used": self.used,
+            "discarded": self.discarded,
+        }
+
+
+# Global prefetcher instance
+question_prefetcher = QuestionPrefetcher()
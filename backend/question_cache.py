@@ -0,0 +1,93 @@
+# Opening question cache for the AI Interview System
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("OPENING_CACHE_SIZE", "128"))
+DEFAULT_TTL = float(os.getenv("OPENING_CACHE_TTL", "3600"))
+DEFAULT_POOL_SIZE = int(os.getenv("OPENING_CACHE_POOL", "3"))
+
+
+class OpeningQuestionCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL, pool_size=DEFAULT_POOL_SIZE):
+        """
+        Bounded LRU+TTL cache of INTRO/QUESTION pairs for /api/start.
+        Each key holds a small pool; until the pool is full every lookup is a miss
+        so new pairs keep being generated, after that lookups rotate through it.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.pool_size = pool_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(jd, candidate_level, question_count):
+        """
+        Normalize the job description so trivially different JDs share a key
+        """
+        normalized_jd = re.sub(r"\s+", " ", str(jd)).strip().lower()
+        return (normalized_jd, str(candidate_level).upper(), int(question_count))
+
+    def get(self, key):
+        """
+        Return a cached {'intro', 'question'} dict, or None on a miss
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry["created"] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None or len(entry["pool"]) < self.pool_size:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            pair = entry["pool"][entry["next"] % len(entry["pool"])]
+            entry["next"] += 1
+            self.hits += 1
+            return dict(pair)
+
+    def put(self, key, intro, question):
+        """
+        Add a freshly generated pair to the key's pool
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = {"pool": [], "next": 0, "created": time.monotonic()}
+                self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if len(entry["pool"]) < self.pool_size:
+                entry["pool"].append({"intro": intro, "question": question})
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Cache counters for health/metrics endpoints
+        """
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "pool_size": self.pool_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+        }
+
+
+# Global opening question cache instance
+opening_question_cache = OpeningQuestionCache()
@@ -0,0 +1,70 @@
+# Request admission control for the AI Interview System
+import os
+import threading
+import time
+from collections import deque
+
+DEFAULT_REQUESTS_PER_MINUTE = float(os.getenv("GEMINI_RPM", "60"))
+DEFAULT_BURST = int(os.getenv("GEMINI_BURST", "5"))
+
+
+class TokenBucket:
+    def __init__(self, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, burst=DEFAULT_BURST):
+        """
+        Token bucket with a FIFO wait queue.
+        Tokens refill at `requests_per_minute` up to `burst`; callers are admitted
+        strictly in arrival order so one busy session cannot starve the others.
+        """
+        self.rate = requests_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+        self._waiters = deque()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, deadline):
+        """
+        Wait for a token until the monotonic `deadline`.
+        Returns True once admitted, False if the deadline passed first.
+        """
+        ticket = object()
+        with self._cond:
+            self._waiters.append(ticket)
+            try:
+                while True:
+                    self._refill()
+                    is_head = self._waiters[0] is ticket
+                    if is_head and self._tokens >= 1:
+                        self._tokens -= 1
+                        return True
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    if is_head and self.rate > 0:
+                        # Sleep until the next token is due
+                        remaining = min(remaining, (1 - self._tokens) / self.rate)
+                    self._cond.wait(remaining)
+            finally:
+                self._waiters.remove(ticket)
+                self._cond.notify_all()
+
+    def queue_depth(self):
+        """
+        Number of callers currently waiting for a token
+        """
+        return len(self._waiters)
+
+    def stats(self):
+        with self._cond:
+            self._refill()
+            return {
+                "requests_per_minute": self.rate * 60.0,
+                "burst": self.capacity,
+                "tokens_available": round(self._tokens, 2),
+                "queue_depth": len(self._waiters),
+            }
@@ -0,0 +1,60 @@
+# Per-session report memoization for the AI Interview System
+import hashlib
+import json
+import threading
+
+
+def transcript_key(session_data):
+    """
+    Hash of everything the report content depends on
+    """
+    payload = json.dumps([
+        session_data.get('jd'),
+        session_data.get('experience'),
+        session_data.get('transcript', []),
+        session_data.get('strikes', 0),
+    ])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SessionReportCache:
+    def __init__(self):
+        """
+        Memoizes the AI evaluation and rendered PDF per session.
+        The entry is stored in the session dict under 'report_cache' together with
+        the transcript hash it was built from, so any change to the transcript
+        invalidates it. A per-session lock, kept in the session dict so it goes
+        away with the session, makes concurrent requests share one build.
+        """
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _session_lock(self, session):
+        with self._lock:
+            return session.setdefault('report_lock', threading.Lock())
+
+    def get_or_build(self, session, session_data, build):
+        """
+        Return the cached entry for the current transcript, or call
+        `build(session_data)` -> {'evaluation', 'pdf_bytes'} and cache its result.
+        Entries without an evaluation are returned but not cached.
+        """
+        key = transcript_key(session_data)
+        with self._session_lock(session):
+            entry = session.get('report_cache')
+            if entry and entry['key'] == key:
+                self.hits += 1
+                return entry
+            self.misses += 1
+            entry = dict(build(session_data), key=key)
+            if entry.get('evaluation'):
+                session['report_cache'] = entry
+            return entry
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+
+# Global report cache instance
+report_cache = SessionReportCache()
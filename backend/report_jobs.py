@@ -0,0 +1,145 @@
+# Background report generation jobs for the AI Interview System
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+# Reports built at once; each is one LLM evaluation plus a reportlab render
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", "2"))
+# Jobs queued or running at once across all sessions; beyond this submissions are rejected
+REPORT_QUEUE_SIZE = int(os.getenv("REPORT_QUEUE_SIZE", str(REPORT_WORKERS * 8)))
+# How long finished jobs stay in memory; their result also lives in the session's report cache
+REPORT_JOB_TTL = float(os.getenv("REPORT_JOB_TTL", "3600"))
+
+
+class ReportQueueFull(RuntimeError):
+    """Raised when too many reports are already queued"""
+
+
+class ReportJobManager:
+    def __init__(self, max_workers=REPORT_WORKERS, queue_size=REPORT_QUEUE_SIZE, job_ttl=REPORT_JOB_TTL):
+        """
+        Builds interview reports off the request path.
+        There is at most one job per session, tagged with the transcript hash it
+        was submitted for: resubmitting the same transcript joins the running job,
+        a changed transcript starts a new one. A failed job, or one that only
+        produced the fallback PDF because the evaluation failed, is kept until a
+        caller asks for a retry, so status polling never reruns the build.
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report")
+        self.queue_size = queue_size
+        self.job_ttl = job_ttl
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.deduplicated = 0
+        self.rejected = 0
+        self.failed = 0
+
+    def submit(self, session_id, key, build, retry=False):
+        """
+        Run `build()` -> report entry in the background for `session_id`.
+        Returns the job's status dict; raises ReportQueueFull when the queue is full.
+        With retry=True a failed or evaluation-less job for the same transcript
+        is started again.
+        """
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(session_id)
+            rerun = retry and job is not None and (job["status"] == "failed" or job["degraded"])
+            if job is not None and job["key"] == key and not rerun:
+                self.deduplicated += 1
+                return self._describe(session_id, job)
+            pending = sum(1 for other in self._jobs.values() if other["status"] in ("queued", "running"))
+            if pending >= self.queue_size:
+                self.rejected += 1
+                raise ReportQueueFull(f"{pending} reports already queued")
+            job = {
+                "key": key,
+                "status": "queued",
+                "error": None,
+                "degraded": False,
+                "created": time.monotonic(),
+                "started": None,
+                "finished": None,
+            }
+            job["future"] = self._executor.submit(self._run, session_id, job, build)
+            self._jobs[session_id] = job
+            self.submitted += 1
+            return self._describe(session_id, job)
+
+    def _run(self, session_id, job, build):
+        job["status"] = "running"
+        job["started"] = time.monotonic()
+        try:
+            report = build()
+            if not report.get("pdf_bytes") and not report.get("evaluation"):
+                raise RuntimeError("Evaluation generation failed")
+        except Exception as e:
+            print(f"ERROR in report job for session {session_id}: {e}")
+            job["error"] = str(e)
+            job["status"] = "failed"
+            self.failed += 1
+            raise
+        finally:
+            job["finished"] = time.monotonic()
+        # A fallback PDF without the AI evaluation is served, but can be retried
+        job["degraded"] = not report.get("evaluation")
+        job["status"] = "done"
+        return report
+
+    def get(self, session_id, wait=0):
+        """
+        Wait up to `wait` seconds for the session's job.
+        Returns (status dict, report entry or None); the status dict is None if
+        the session has no job.
+        """
+        with self._lock:
+            job = self._jobs.get(session_id)
+        if job is None:
+            return None, None
+        try:
+            report = job["future"].result(timeout=wait)
+        except FutureTimeout:
+            report = None
+        except Exception:
+            report = None
+        return self._describe(session_id, job), report
+
+    def _describe(self, session_id, job):
+        now = time.monotonic()
+        return {
+            "session_id": session_id,
+            "key": job["key"],
+            "status": job["status"],
+            "error": job["error"],
+            "degraded": job["degraded"],
+            "elapsed": (job["finished"] or now) - job["created"],
+        }
+
+    def _prune(self):
+        # Caller holds self._lock
+        cutoff = time.monotonic() - self.job_ttl
+        expired = [
+            session_id for session_id, job in self._jobs.items()
+            if job["finished"] is not None and job["finished"] < cutoff
+        ]
+        for session_id in expired:
+            del self._jobs[session_id]
+
+    def stats(self):
+        with self._lock:
+            statuses = [job["status"] for job in self._jobs.values()]
+        return {
+            "jobs": len(statuses),
+            "queued": statuses.count("queued"),
+            "running": statuses.count("running"),
+            "submitted": self.submitted,
+            "deduplicated": self.deduplicated,
+            "rejected": self.rejected,
+            "failed": self.failed,
+        }
+
+
+# Global report job manager instance
+report_jobs = ReportJobManager()
@@ -0,0 +1,238 @@
+# Interviewer response parsing for the AI Interview System
+import json
+import re
+
+FIELDS = ("intro", "feedback", "decision", "question")
+
+# Schema for Gemini's JSON response mode; callers pass the fields they need as `required`
+INTERVIEWER_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "intro": {"type": "STRING"},
+        "feedback": {"type": "STRING"},
+        "decision": {"type": "STRING", "enum": ["NEXT_QUESTION", "INTERVIEW_COMPLETE"]},
+        "question": {"type": "STRING"},
+    },
+}
+
+# A (possibly unterminated) string value for one of the known fields
+_FIELD_RE = re.compile(r'"(intro|feedback|decision|question)"\s*:\s*"((?:[^"\\]|\\.)*)(")?', re.S | re.I)
+
+
+def response_schema(required):
+    """
+    INTERVIEWER_RESPONSE_SCHEMA with the given fields marked required
+    """
+    schema = dict(INTERVIEWER_RESPONSE_SCHEMA)
+    schema["required"] = list(required)
+    return schema
+
+
+def field_label(field, mode):
+    """
+    How a field is introduced in a response of the given mode
+    """
+    return f'"{field}":' if mode == "json" else f"{field.upper()}:"
+
+
+def format_instructions(fields, mode):
+    """
+    Prompt text asking for `fields`, a list of (field, description) pairs, as
+    JSON fields in json mode or as labeled lines otherwise
+    """
+    layout = "a JSON object with these string fields" if mode == "json" else "exactly these labeled lines"
+    return f"Respond with {layout}:\n" + "\n".join(f"{field_label(field, mode)} {description}" for field, description in fields)
+
+
+def missing_fields(parts, required):
+    return [field for field in required if not parts.get(field)]
+
+
+def _clean_value(field, value):
+    value = value.strip()
+    # Models sometimes keep the old "QUESTION: ..." label inside the JSON value
+    if value.upper().startswith(field.upper() + ":"):
+        value = value.split(":", 1)[1].strip()
+    return value.upper() if field == "decision" else value
+
+
+def _decode_partial(raw):
+    """
+    Decode a JSON string body that may be cut off mid-escape
+    """
+    raw = re.sub(r"\\u[0-9a-fA-F]{0,3}$", "", raw)
+    if (len(raw) - len(raw.rstrip("\\"))) % 2:
+        raw = raw[:-1]
+    try:
+        return json.loads(f'"{raw}"')
+    except ValueError:
+        return raw.replace('\\"', '"').replace("\\n", "\n")
+
+
+def _json_fields(text):
+    """
+    Yield (field, value, complete) for every string field found in `text`,
+    including a trailing field whose closing quote has not arrived yet
+    """
+    for match in _FIELD_RE.finditer(text):
+        yield match.group(1).lower(), _decode_partial(match.group(2)), bool(match.group(3))
+
+
+def parse_json_response(resp):
+    """
+    Tolerant parser for JSON-mode responses.
+    Accepts code fences, surrounding prose and truncated output, recovering
+    whatever fields are present.
+    """
+    parts = {field: "" for field in FIELDS}
+    text = resp.strip()
+    if text.startswith("```"):
+        text = re.sub(r"^```(?:json)?\s*|\s*```$", "", text)
+    try:
+        data = json.loads(text[text.index("{"):text.rindex("}") + 1])
+        if isinstance(data, dict):
+            for field in FIELDS:
+                if isinstance(data.get(field), str):
+                    parts[field] = _clean_value(field, data[field])
+            return parts
+    except ValueError:
+        pass
+    for field, value, _ in _json_fields(text):
+        parts[field] = _clean_value(field, value)
+    return parts
+
+
+def looks_like_json(resp):
+    text = resp.lstrip()
+    return text.startswith("{") or text.startswith("```")
+
+
+def parse_response(resp):
+    """
+    Parse an interviewer response in either JSON or labeled-line format
+    """
+    if looks_like_json(resp):
+        return parse_json_response(resp)
+    parts = {field: "" for field in FIELDS}
+    for line in resp.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.upper().startswith("INTRO:"):
+            parts["intro"] = line.split(":", 1)[1].strip()
+        elif line.upper().startswith("FEEDBACK:"):
+            parts["feedback"] = line.split(":", 1)[1].strip()
+        elif line.upper().startswith("DECISION:"):
+            parts["decision"] = line.split(":", 1)[1].strip().upper()
+        elif line.upper().startswith("QUESTION:"):
+            parts["question"] = line.split(":", 1)[1].strip()
+    return parts
+
+class ResponseStreamParser:
+    """
+    Incremental version of parse_response for streamed completions.
+    feed() returns a list of (event, data) tuples:
+      ('feedback_delta', text)  - new feedback text as it arrives
+      ('feedback'|'decision'|'question'|'intro', value) - once a labeled line is complete
+    """
+    LABELS = ("INTRO", "FEEDBACK", "DECISION", "QUESTION")
+
+    def __init__(self):
+        self.parts = {"intro": "", "feedback": "", "decision": "", "question": ""}
+        self.raw = ""
+        self._line = ""
+        self._feedback_sent = 0
+
+    def feed(self, chunk):
+        events = []
+        self.raw += chunk
+        self._line += chunk
+        while "\n" in self._line:
+            line, self._line = self._line.split("\n", 1)
+            events.extend(self._finish_line(line))
+        events.extend(self._feedback_progress(self._line))
+        return events
+
+    def close(self):
+        events = []
+        if self._line:
+            events.extend(self._finish_line(self._line))
+            self._line = ""
+        return events
+
+    def _label(self, line):
+        stripped = line.strip()
+        for label in self.LABELS:
+            if stripped.upper().startswith(label + ":"):
+                return label.lower(), stripped.split(":", 1)[1].strip()
+        return None, None
+
+    def _feedback_progress(self, partial):
+        label, value = self._label(partial)
+        if label != "feedback" or len(value) <= self._feedback_sent:
+            return []
+        delta = value[self._feedback_sent:]
+        self._feedback_sent = len(value)
+        return [("feedback_delta", delta)]
+
+    def _finish_line(self, line):
+        label, value = self._label(line)
+        if not label:
+            return []
+        events = []
+        if label == "feedback":
+            events.extend(self._feedback_progress(line))
+            self._feedback_sent = 0
+        elif label == "decision":
+            value = value.upper()
+        self.parts[label] = value
+        events.append((label, value))
+        return events
+
+
+class JSONResponseStreamParser:
+    """
+    Incremental parser for streamed JSON-mode completions.
+    Emits the same events as ResponseStreamParser, recovering partial string
+    fields as their characters arrive.
+    """
+
+    def __init__(self):
+        self.parts = {field: "" for field in FIELDS}
+        self.raw = ""
+        self._done = set()
+        self._feedback_sent = 0
+
+    def feed(self, chunk):
+        self.raw += chunk
+        events = []
+        for field, value, complete in _json_fields(self.raw):
+            if field in self._done:
+                continue
+            if field == "feedback":
+                partial = value.lstrip()
+                if len(partial) > self._feedback_sent:
+                    events.append(("feedback_delta", partial[self._feedback_sent:]))
+                    self._feedback_sent = len(partial)
+            if complete:
+                self._done.add(field)
+                self.parts[field] = _clean_value(field, value)
+                events.append((field, self.parts[field]))
+        return events
+
+    def close(self):
+        events = []
+        final = parse_json_response(self.raw)
+        for field in FIELDS:
+            if field not in self._done and final[field]:
+                self._done.add(field)
+                self.parts[field] = final[field]
+                events.append((field, final[field]))
+        return events
+
+
+def stream_parser_for(mode):
+    """
+    Streaming parser matching the interviewer response mode
+    """
+    return JSONResponseStreamParser() if mode == "json" else ResponseStreamParser()
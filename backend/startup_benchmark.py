@@ -0,0 +1,114 @@
+# Startup-time benchmark for the AI Interview System backend
+#
+# Imports each module in a fresh interpreter with `-X importtime` and reports
+# its cumulative import cost, so regressions in startup time are easy to spot:
+#
+#     python startup_benchmark.py --runs 5 --json startup.json
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Backend modules first, then the heavy third-party packages they used to import eagerly
+MODULES = [
+    "app",
+    "interview_logic",
+    "llm_client",
+    "face_detection",
+    "tts_manager",
+    "cv2",
+    "numpy",
+    "reportlab.platypus",
+    "google.generativeai",
+    "speech_recognition",
+    "pygame",
+    "flask",
+]
+
+
+def measure_import(module, extra_env=None):
+    """
+    Import `module` in a new interpreter.
+    Returns (wall_seconds, cumulative_import_seconds, error).
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1", **(extra_env or {}))
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        lines = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")]
+        return wall, None, (lines[-1] if lines else f"exit code {proc.returncode}")
+    cumulative = None
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            try:
+                cumulative = max(cumulative or 0, int(parts[1]) / 1e6)
+            except ValueError:
+                pass
+    return wall, cumulative, None
+
+
+def run(modules, runs, warm_up=""):
+    results = {}
+    for module in modules:
+        walls, imports, error = [], [], None
+        for _ in range(runs):
+            wall, cumulative, error = measure_import(module, {"WARM_UP": warm_up})
+            if error:
+                break
+            walls.append(wall)
+            if cumulative is not None:
+                imports.append(cumulative)
+        results[module] = {
+            "wall_median_s": statistics.median(walls) if walls else None,
+            "import_median_s": statistics.median(imports) if imports else None,
+            "runs": len(walls),
+            "error": error,
+        }
+    return results
+
+
+def print_table(results):
+    print(f"{'module':<24} {'import (s)':>11} {'process (s)':>12}")
+    for module, result in results.items():
+        if result["error"]:
+            print(f"{module:<24} {'failed':>11}  {result['error']}")
+            continue
+        import_s = result["import_median_s"]
+        print(f"{module:<24} {import_s if import_s is not None else float('nan'):>11.3f} {result['wall_median_s']:>12.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-module import cost of the backend")
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per module; the median is reported")
+    parser.add_argument("--warm-up", default="", help="WARM_UP value to import with, e.g. 'all'")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = run(args.modules, args.runs, args.warm_up)
+    print_table(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "python": sys.version.split()[0],
+                "runs": args.runs,
+                "warm_up": args.warm_up,
+                "results": results,
+            }, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
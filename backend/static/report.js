@@ -12,12 +12,23 @@ document.addEventListener('DOMContentLoaded', async () => {
     }
     
     try {
-        // Fetch report data
-        const response = await fetch('/api/report', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ session_id: sessionId })
-        });
+        // Fetch report data; 202 means it is still being generated in the background
+        // and 503 that the report queue is full, so wait (honouring Retry-After) and ask again
+        let response;
+        let delay = 1000;
+        while (true) {
+            response = await fetch('/api/report', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ session_id: sessionId })
+            });
+            if (response.status !== 202 && response.status !== 503) {
+                break;
+            }
+            const retryAfter = Number(response.headers.get('Retry-After'));
+            await new Promise(resolve => setTimeout(resolve, retryAfter > 0 ? retryAfter * 1000 : delay));
+            delay = Math.min(delay * 2, 10000);
+        }
         
         if (!response.ok) {
             throw new Error(`HTTP ${response.status}: ${response.statusText}`);
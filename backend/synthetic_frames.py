@@ -0,0 +1,154 @@
+# Deterministic synthetic camera frames for checking and benchmarking face detection
+import os
+
+from lazy_imports import lazy_import
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+RESOLUTIONS = [(320, 240), (640, 480), (1280, 720)]
+KINDS = ["blank", "dark", "bright", "noisy", "blurred", "scene", "face", "two_faces"]
+
+# Expected analyzer verdicts per kind; keys the current thresholds do not pin down are left out
+EXPECTED = {
+    "blank": {"is_covered": True, "face_count": 0},
+    "dark": {"is_too_dark": True, "is_covered": True, "face_count": 0},
+    "bright": {"is_too_bright": True, "face_count": 0},
+    "noisy": {"is_covered": False, "is_too_dark": False, "is_too_bright": False, "face_count": 0},
+    "blurred": {"is_covered": True, "face_count": 0},
+    "scene": {"is_covered": False, "is_too_dark": False, "is_too_bright": False, "face_count": 0},
+    "face": {"is_covered": False, "is_too_dark": False, "is_too_bright": False, "face_count": 1},
+    "two_faces": {"is_covered": False, "is_too_dark": False, "is_too_bright": False, "face_count": 2},
+}
+
+
+def _draw_face(image, cx, cy, size, rng):
+    """
+    Paint a frontal-face-like pattern: a bright oval with darker eyes, brows,
+    nose shadow and mouth, which the frontal Haar cascade responds to.
+    """
+    skin = int(rng.integers(160, 200))
+    eye = int(rng.integers(30, 60))
+
+    def part(dx, dy, rx, ry, shade):
+        cv2.ellipse(image, (cx + int(size * dx), cy + int(size * dy)), (int(size * rx), int(size * ry)), 0, 0, 360, (shade,) * 3, -1)
+
+    part(0, 0, 0.42, 0.55, skin)
+    for side in (-1, 1):
+        part(0.18 * side, -0.12, 0.11, 0.06, eye)
+        part(0.18 * side, -0.24, 0.12, 0.03, eye + 30)
+    part(0, 0.12, 0.06, 0.04, skin - 50)
+    part(0, 0.28, 0.15, 0.04, eye + 20)
+
+
+def make_frame(kind, width=640, height=480, seed=0):
+    """
+    Build one BGR frame of the given kind. The same (kind, size, seed) always
+    produces the same pixels.
+    """
+    rng = np.random.default_rng(seed)
+    if kind == "blank":
+        return np.full((height, width, 3), 128, np.uint8)
+    if kind == "dark":
+        return rng.integers(0, 12, (height, width, 3), dtype=np.uint8)
+    if kind == "bright":
+        return rng.integers(243, 256, (height, width, 3), dtype=np.uint8)
+    if kind == "noisy":
+        return rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+    # A room-like background: vertical gradient, a few furniture blocks, light noise
+    ramp = np.linspace(70, 150, height, dtype=np.float32)[:, None]
+    image = np.repeat(np.repeat(ramp, width, axis=1)[:, :, None], 3, axis=2).astype(np.uint8)
+    for _ in range(6):
+        x0, y0 = int(rng.integers(0, width)), int(rng.integers(0, height))
+        x1, y1 = x0 + int(rng.integers(width // 10, width // 3)), y0 + int(rng.integers(height // 10, height // 3))
+        shade = int(rng.integers(40, 220))
+        cv2.rectangle(image, (x0, y0), (x1, y1), (shade, shade, shade), -1)
+    if kind in ("face", "two_faces"):
+        size = height // 3
+        if kind == "face":
+            _draw_face(image, width // 2, height // 2, size, rng)
+        else:
+            _draw_face(image, width // 3, height // 2, size, rng)
+            _draw_face(image, 2 * width // 3, height // 2, size, rng)
+    noise = rng.normal(0, 6, image.shape)
+    image = np.clip(image.astype(np.float32) + noise, 0, 255).astype(np.uint8)
+    if kind == "blurred":
+        # A hand or tape over the lens: nothing but very soft gradients
+        k = (max(width, height) // 8) | 1
+        image = cv2.GaussianBlur(image, (k, k), 0)
+    return image
+
+
+def face_enters_sequence(width=640, height=480, seed=0, steady=6, after=10):
+    """
+    A candidate sitting still, then a second person coming into view beside
+    them: `steady` one-face frames followed by `after` two-face frames, each
+    with fresh sensor noise. Returns a list of (face_count, BGR frame).
+    """
+    rng = np.random.default_rng(seed)
+    one_face = make_frame("face", width, height, seed)
+    two_faces = one_face.copy()
+    size = height // 3
+    _draw_face(two_faces, width // 2 + int(size * 1.25), height // 2, size, rng)
+    frames = []
+    for face_count, image, count in ((1, one_face, steady), (2, two_faces, after)):
+        for _ in range(count):
+            noisy = np.clip(image.astype(np.float32) + rng.normal(0, 3, image.shape), 0, 255).astype(np.uint8)
+            frames.append((face_count, noisy))
+    return frames
+
+
+def scale_brightness(image, target):
+    """
+    Rescale a frame's intensities so its grayscale mean lands near `target`,
+    for probing the brightness thresholds
+    """
+    gray_mean = float(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY).mean())
+    pixels = image.astype(np.float32)
+    if target <= gray_mean:
+        pixels *= target / max(gray_mean, 1.0)
+    else:
+        # Compress toward white so bright targets are reached without clipping
+        pixels = 255 - (255 - pixels) * ((255 - target) / max(255 - gray_mean, 1.0))
+    return np.clip(pixels, 0, 255).astype(np.uint8)
+
+
+def encode_jpeg(image, quality=80):
+    """
+    JPEG-encode a frame the way the browser client does (canvas.toDataURL, q=0.8)
+    """
+    ok, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("JPEG encoding failed")
+    return buffer.tobytes()
+
+
+def build_corpus(resolutions=RESOLUTIONS, kinds=KINDS, variants=3, seed=0):
+    """
+    Returns a list of {'kind', 'width', 'height', 'seed', 'jpeg'} entries
+    """
+    corpus = []
+    for width, height in resolutions:
+        for kind in kinds:
+            for variant in range(variants):
+                frame_seed = seed + variant
+                corpus.append({
+                    "kind": kind,
+                    "width": width,
+                    "height": height,
+                    "seed": frame_seed,
+                    "jpeg": encode_jpeg(make_frame(kind, width, height, frame_seed)),
+                })
+    return corpus
+
+
+def write_corpus(directory, **kwargs):
+    """
+    Save the corpus as <kind>_<w>x<h>_<seed>.jpg files for manual inspection
+    """
+    os.makedirs(directory, exist_ok=True)
+    for entry in build_corpus(**kwargs):
+        name = f"{entry['kind']}_{entry['width']}x{entry['height']}_{entry['seed']}.jpg"
+        with open(os.path.join(directory, name), "wb") as f:
+            f.write(entry["jpeg"])
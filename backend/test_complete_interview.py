@@ -68,13 +68,13 @@ def test_complete_interview():
         
         if report_data.get('success'):
             print("Report generated successfully!")
-            print(f"Report type: {'PDF' if report_data.get('pdf_base64') else 'Text'}")
+            print(f"Report type: {'PDF' if report_data.get('pdf_url') else 'Text'}")
             print(f"Job: {report_data.get('job_description', 'N/A')}")
             print(f"Experience: {report_data.get('experience', 'N/A')}")
             print(f"Transcript length: {len(report_data.get('transcript', []))} entries")
             print(f"Strikes: {report_data.get('strikes', 0)}")
             
-            if report_data.get('pdf_base64'):
+            if report_data.get('pdf_url'):
                 print("PDF report ready for download")
             else:
                 print("Text report ready for download")
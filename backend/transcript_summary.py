@@ -0,0 +1,99 @@
+# Rolling transcript summaries for the AI Interview System
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from llm_client import llm_client
+
+SUMMARY_TOKEN_BUDGET = int(os.getenv("SUMMARY_TOKEN_BUDGET", "400"))
+# Longest digest kept for a single transcript line, in characters
+SUMMARY_LINE_CHARS = int(os.getenv("SUMMARY_LINE_CHARS", "240"))
+
+_PREFIXES = (("Interviewer:", "Q:"), ("Candidate:", "A:"), ("Feedback:", "F:"))
+
+
+def estimate_tokens(text):
+    """
+    Rough token count (about 4 characters per token for English)
+    """
+    return len(text) // 4 + 1
+
+
+def digest_line(line, max_chars=SUMMARY_LINE_CHARS):
+    """
+    Compact one transcript line into a short labeled note
+    """
+    for prefix, short in _PREFIXES:
+        if line.startswith(prefix):
+            line = f"{short} {line[len(prefix):].strip()}"
+            break
+    line = " ".join(line.split())
+    if len(line) > max_chars:
+        line = line[:max_chars - 3].rstrip() + "..."
+    return line
+
+
+class TranscriptSummarizer:
+    def __init__(self, token_budget=SUMMARY_TOKEN_BUDGET, max_workers=2):
+        """
+        Keeps a per-session summary of the transcript under `token_budget`.
+        Each turn appends short extractive notes; once the notes pass the budget
+        they are condensed by the LLM in the background, and the oldest notes are
+        dropped if the summary grows past twice the budget in the meantime.
+        State lives in the session dict under 'summary_lines' and 'summary_upto'.
+        """
+        self.token_budget = token_budget
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="summary")
+        self._lock = threading.Lock()
+        self.compressions = 0
+
+    def update(self, session):
+        """
+        Fold transcript lines added since the last update into the summary
+        """
+        transcript = session.get("transcript", [])
+        with self._lock:
+            lines = session.setdefault("summary_lines", [])
+            start = session.get("summary_upto", 0)
+            lines.extend(digest_line(line) for line in transcript[start:])
+            session["summary_upto"] = len(transcript)
+
+            while len(lines) > 1 and estimate_tokens("\n".join(lines)) > 2 * self.token_budget:
+                lines.pop(0)
+
+            if estimate_tokens("\n".join(lines)) > self.token_budget and not session.get("summary_compressing"):
+                session["summary_compressing"] = True
+                self._executor.submit(self._compress, session, list(lines))
+
+    def summary(self, session):
+        with self._lock:
+            return "\n".join(session.get("summary_lines", []))
+
+    def _compress(self, session, snapshot):
+        prompt = (
+            f"Condense these interview notes to under {self.token_budget * 3 // 4} words. "
+            "Keep, per question, what was asked, how the candidate answered and how it was assessed. "
+            "Return plain text notes only.\n\n" + "\n".join(snapshot)
+        )
+        try:
+            condensed = llm_client.generate(prompt).strip()
+        except Exception as e:
+            print(f"ERROR compressing transcript summary: {e}")
+            condensed = ""
+        with self._lock:
+            session["summary_compressing"] = False
+            lines = session.get("summary_lines", [])
+            # Only replace the notes that were condensed; later notes stay verbatim
+            if condensed and lines[:len(snapshot)] == snapshot:
+                session["summary_lines"] = [condensed] + lines[len(snapshot):]
+                self.compressions += 1
+
+    def stats(self):
+        return {
+            "token_budget": self.token_budget,
+            "compressions": self.compressions,
+        }
+
+
+# Global transcript summarizer instance
+transcript_summarizer = TranscriptSummarizer()
@@ -0,0 +1,144 @@
+# Text-to-speech engines for the AI Interview System
+import io
+import os
+import tempfile
+import threading
+
+# Comma-separated engine names; later engines are only used if earlier ones fail
+TTS_BACKENDS = os.getenv("TTS_BACKENDS", "gtts")
+
+# Four silent MPEG-1 Layer III frames (32 kbps, 44.1 kHz, mono), about 0.1s
+STUB_CLIP = (b"\xff\xfb\x10\xc4" + b"\x00" * 100) * 4
+
+
+def audio_mimetype(data):
+    """
+    Sniff the container of a synthesized clip
+    """
+    if data[:4] == b"RIFF":
+        return "audio/wav"
+    return "audio/mpeg"
+
+
+class TTSBackend:
+    """Base class for speech engines; synthesize() returns encoded audio bytes"""
+    name = "base"
+    mimetype = "audio/mpeg"
+
+    def synthesize(self, text, lang="en", slow=False):
+        raise NotImplementedError
+
+    def synthesize_from(self, text, lang="en", slow=False):
+        """
+        Returns (audio bytes, name of the engine that produced them)
+        """
+        return self.synthesize(text, lang, slow), self.name
+
+    @property
+    def primary(self):
+        """Name of the engine whose clips are the preferred output"""
+        return self.name
+
+
+class GTTSBackend(TTSBackend):
+    """Google Translate TTS over the network (MP3)"""
+    name = "gtts"
+
+    def synthesize(self, text, lang="en", slow=False):
+        from gtts import gTTS
+        fp = io.BytesIO()
+        gTTS(text=text, lang=lang, slow=slow).write_to_fp(fp)
+        return fp.getvalue()
+
+
+class LocalTTSBackend(TTSBackend):
+    """Offline on-box engine via pyttsx3 (espeak/SAPI/NSSpeech), WAV output"""
+    name = "local"
+    mimetype = "audio/wav"
+
+    def __init__(self):
+        self._engine = None
+        # pyttsx3 engines are not thread-safe
+        self._lock = threading.Lock()
+
+    def _get_engine(self):
+        if self._engine is None:
+            import pyttsx3
+            self._engine = pyttsx3.init()
+        return self._engine
+
+    def synthesize(self, text, lang="en", slow=False):
+        with self._lock:
+            engine = self._get_engine()
+            engine.setProperty("rate", 130 if slow else 175)
+            fd, path = tempfile.mkstemp(suffix=".wav")
+            os.close(fd)
+            try:
+                engine.save_to_file(text, path)
+                engine.runAndWait()
+                with open(path, "rb") as f:
+                    return f.read()
+            finally:
+                os.remove(path)
+
+
+class StubTTSBackend(TTSBackend):
+    """Deterministic zero-cost engine for capacity tests: a tiny fixed silent clip"""
+    name = "stub"
+
+    def synthesize(self, text, lang="en", slow=False):
+        return STUB_CLIP
+
+
+class FailoverTTSBackend(TTSBackend):
+    def __init__(self, backends):
+        """
+        Tries each engine in order and returns the first successful clip
+        """
+        self.backends = backends
+        self.name = "+".join(backend.name for backend in backends)
+        # Only a chain of MP3 engines can promise MP3; otherwise each clip must be sniffed
+        mimetypes = {backend.mimetype for backend in backends}
+        self.mimetype = mimetypes.pop() if len(mimetypes) == 1 else None
+        self.failovers = 0
+
+    @property
+    def primary(self):
+        return self.backends[0].name
+
+    def synthesize(self, text, lang="en", slow=False):
+        return self.synthesize_from(text, lang, slow)[0]
+
+    def synthesize_from(self, text, lang="en", slow=False):
+        last_error = None
+        for backend in self.backends:
+            try:
+                return backend.synthesize(text, lang, slow), backend.name
+            except Exception as e:
+                print(f"ERROR in {backend.name} TTS, failing over: {e}")
+                self.failovers += 1
+                last_error = e
+        raise last_error
+
+
+BACKENDS = {
+    "gtts": GTTSBackend,
+    "local": LocalTTSBackend,
+    "stub": StubTTSBackend,
+}
+
+
+def create_tts_backend(spec=TTS_BACKENDS):
+    """
+    Build the engine (or failover chain) described by a spec like "gtts,stub"
+    """
+    names = [name.strip().lower() for name in spec.split(",") if name.strip()]
+    unknown = [name for name in names if name not in BACKENDS]
+    if unknown or not names:
+        raise ValueError(f"Unknown TTS backend(s) {unknown}; choose from {sorted(BACKENDS)}")
+    backends = [BACKENDS[name]() for name in names]
+    return backends[0] if len(backends) == 1 else FailoverTTSBackend(backends)
+
+
+# Global TTS backend instance
+tts_backend = create_tts_backend()
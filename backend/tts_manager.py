@@ -1,47 +1,86 @@
 # Text-to-Speech Module for AI Interview System
-import pygame
+import io
 import tempfile
 import os
 import threading
 import time
 from queue import Queue, Empty
-import speech_recognition as sr
+from interview_logic import synthesize_speech
+from lazy_imports import lazy_import
+from tts_backends import tts_backend
+
+pygame = lazy_import("pygame")
+sr = lazy_import("speech_recognition")
+
+# Play speech through the server's own sound device. Off by default: web clients
+# fetch their audio from /api/audio, and a headless server has nothing to play on.
+TTS_LOCAL_PLAYBACK = os.getenv("TTS_LOCAL_PLAYBACK", "0") == "1"
 
 class TTSManager:
-    def __init__(self):
+    def __init__(self, local_playback=TTS_LOCAL_PLAYBACK):
         """Initialize TTS Manager"""
+        self.local_playback = local_playback
         self.audio_queue = Queue()
         self.is_speaking = False
         self.current_audio = None
         self.recording = False
-        self.recognizer = sr.Recognizer()
+        self.recognizer = None
         self.microphone = None
         self.recording_thread = None
         self.last_speech_time = 0
         self.recording_timeout = 5.0  # 5 seconds of silence
-        
-        # Initialize pygame mixer
-        pygame.mixer.init()
-        pygame.mixer.music.set_volume(0.8)
-        
-        # Initialize microphone
-        try:
-            self.microphone = sr.Microphone()
-            with self.microphone as source:
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
-            print("Microphone initialized for TTS")
-        except Exception as e:
-            print(f"Microphone initialization failed: {e}")
+        self.stale_after = 30.0  # Drop utterances queued longer than this
+        self._generation = 0
+        self._worker = None
+        self._state_lock = threading.Lock()
+        # The mixer and microphone are opened on first use, not at import
+        self._mixer_ready = False
+        self._microphone_checked = False
+        self._device_lock = threading.Lock()
+    
+    def ensure_mixer(self):
+        """
+        Initialize the pygame mixer once
+        """
+        with self._device_lock:
+            if not self._mixer_ready:
+                pygame.mixer.init()
+                pygame.mixer.music.set_volume(0.8)
+                self._mixer_ready = True
+    
+    def ensure_microphone(self):
+        """
+        Open and calibrate the microphone once; returns it, or None if unavailable
+        """
+        with self._device_lock:
+            if not self._microphone_checked:
+                self._microphone_checked = True
+                self.recognizer = sr.Recognizer()
+                try:
+                    self.microphone = sr.Microphone()
+                    with self.microphone as source:
+                        self.recognizer.adjust_for_ambient_noise(source, duration=1)
+                    print("Microphone initialized for TTS")
+                except Exception as e:
+                    self.microphone = None
+                    print(f"Microphone initialization failed: {e}")
+        return self.microphone
     
-    def speak_text(self, text, callback=None):
+    def speak_text(self, text, callback=None, interrupt=False):
         """
-        Convert text to speech and play it
+        Queue text to be spoken after anything already queued.
+        With interrupt=True, the current and queued utterances are dropped first.
         """
         try:
             print(f"Speaking: {text[:50]}...")
             
-            # For now, we'll use a simple approach with pygame
-            # In production, you might want to use gTTS or other TTS services
+            if interrupt:
+                self.interrupt()
+            if not self.local_playback:
+                # Nothing is synthesized or played here; clients fetch audio from the audio jobs
+                print(f"TTS: {text}")
+                self._on_speech_complete(callback)
+                return
             self._speak_with_pygame(text, callback)
             
         except Exception as e:
@@ -51,19 +90,84 @@ class TTSManager:
     
     def _speak_with_pygame(self, text, callback=None):
         """
-        Simple text-to-speech using pygame (placeholder)
-        In production, replace with actual TTS service
+        Hand an utterance to the single playback worker
         """
-        # This is a placeholder - in production, use gTTS, Azure TTS, or similar
-        print(f"TTS: {text}")
-        
-        # Simulate speaking time
-        speaking_time = len(text) * 0.05  # Rough estimate
-        threading.Timer(speaking_time, lambda: self._on_speech_complete(callback)).start()
+        self._ensure_worker()
+        with self._state_lock:
+            generation = self._generation
+        self.audio_queue.put({
+            "text": text,
+            "callback": callback,
+            "generation": generation,
+            "queued_at": time.monotonic(),
+        })
+    
+    def _ensure_worker(self):
+        with self._state_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._playback_loop, name="tts-playback", daemon=True)
+                self._worker.start()
+    
+    def _playback_loop(self):
+        """Single consumer: plays queued utterances in order"""
+        while True:
+            item = self.audio_queue.get()
+            try:
+                if self._is_stale(item):
+                    print(f"TTS: dropping stale utterance: {item['text'][:50]}...")
+                    continue
+                self.is_speaking = True
+                self.current_audio = item
+                self._play_clip(item)
+                if not self._is_stale(item):
+                    self._on_speech_complete(item["callback"])
+            except Exception as e:
+                print(f"TTS playback error ({tts_backend.name}): {e}")
+            finally:
+                self.current_audio = None
+                self.is_speaking = False
+                self.audio_queue.task_done()
+    
+    def _is_stale(self, item):
+        if item["generation"] != self._generation:
+            return True
+        return time.monotonic() - item["queued_at"] > self.stale_after
+    
+    def _play_clip(self, item):
+        """Synthesize and play one utterance, stopping early if it is interrupted"""
+        print(f"TTS: {item['text']}")
+        audio_bytes = synthesize_speech(item["text"])
+        if not audio_bytes or self._is_stale(item):
+            return
+        self.ensure_mixer()
+        pygame.mixer.music.load(io.BytesIO(audio_bytes))
+        pygame.mixer.music.play()
+        while pygame.mixer.music.get_busy():
+            if item["generation"] != self._generation:
+                pygame.mixer.music.stop()
+                return
+            time.sleep(0.05)
+    
+    def interrupt(self):
+        """
+        Stop the current utterance and drop everything queued
+        """
+        with self._state_lock:
+            self._generation += 1
+        while True:
+            try:
+                self.audio_queue.get_nowait()
+                self.audio_queue.task_done()
+            except Empty:
+                break
+        if self._mixer_ready:
+            try:
+                pygame.mixer.music.stop()
+            except Exception:
+                pass
     
     def _on_speech_complete(self, callback):
         """Called when speech is complete"""
-        self.is_speaking = False
         if callback:
             callback()
     
@@ -71,7 +175,7 @@ class TTSManager:
         """
         Start audio recording with 5-second silence detection
         """
-        if not self.microphone:
+        if not self.ensure_microphone():
             print("No microphone available")
             return None
         
@@ -163,6 +267,12 @@ def start_answer_recording(silence_callback):
     """
     return tts_manager.start_recording(silence_callback)
 
+def stop_speaking():
+    """
+    Interrupt current speech and clear queued utterances
+    """
+    tts_manager.interrupt()
+
 def stop_answer_recording():
     """
     Stop recording user's answer
@@ -0,0 +1,62 @@
+# Check the fast frame quality analyzer against the exact one on synthetic frames
+#
+# Every frame of the synthetic corpus, plus scenes rescaled to sit just either
+# side of the brightness thresholds, is analyzed in both modes. The fast mode
+# must reach the same is_too_dark / is_too_bright / is_covered verdicts as the
+# exact mode and the ones expected for each kind of frame:
+#
+#     python validate_quality.py
+import sys
+
+from face_detection import FaceDetector, decode_frame
+from synthetic_frames import EXPECTED, RESOLUTIONS, build_corpus, encode_jpeg, make_frame, scale_brightness
+
+VERDICTS = ("is_too_dark", "is_too_bright", "is_covered")
+# Means close to the 10 (covered), 15 (too dark) and 240 (too bright) thresholds
+BRIGHTNESS_PROBES = [6, 9, 11, 13, 17, 20, 230, 237, 243, 248]
+# Largest acceptable difference between the two brightness estimates
+MAX_BRIGHTNESS_ERROR = 1.0
+
+
+def probe_frames():
+    frames = []
+    for width, height in RESOLUTIONS:
+        for target in BRIGHTNESS_PROBES:
+            image = scale_brightness(make_frame("scene", width, height), target)
+            frames.append({"kind": f"scene@{target}", "width": width, "height": height, "jpeg": encode_jpeg(image)})
+    return frames
+
+
+def validate(detector=None):
+    """
+    Returns a list of human-readable failures (empty if the fast mode agrees)
+    """
+    detector = detector or FaceDetector()
+    failures = []
+    for entry in build_corpus() + probe_frames():
+        label = f"{entry['kind']} {entry['width']}x{entry['height']}"
+        frame = decode_frame(entry["jpeg"])
+        exact = detector.analyze_quality(frame, mode="exact")
+        fast = detector.analyze_quality(frame, mode="fast")
+        if "error" in fast or "error" in exact:
+            failures.append(f"{label}: analysis failed ({fast.get('error') or exact.get('error')})")
+            continue
+        for verdict in VERDICTS:
+            if fast[verdict] != exact[verdict]:
+                failures.append(f"{label}: {verdict} fast={fast[verdict]} exact={exact[verdict]} "
+                                f"(blur {fast['blur_score']:.1f} vs {exact['blur_score']:.1f})")
+        for verdict, expected in EXPECTED.get(entry["kind"], {}).items():
+            if verdict in VERDICTS and fast[verdict] != expected:
+                failures.append(f"{label}: {verdict}={fast[verdict]}, expected {expected}")
+        error = abs(fast["brightness"] - exact["brightness"])
+        if error > MAX_BRIGHTNESS_ERROR:
+            failures.append(f"{label}: brightness {fast['brightness']:.2f} vs {exact['brightness']:.2f}")
+    return failures
+
+
+if __name__ == "__main__":
+    failures = validate()
+    for failure in failures:
+        print(f"MISMATCH {failure}")
+    print(f"{len(failures)} mismatches")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,66 @@
+# Opt-in eager initialization for the AI Interview System
+import os
+import time
+
+from lazy_imports import ensure_loaded
+
+# Comma-separated components to initialize at startup, or "all"; empty keeps everything lazy
+WARM_UP = os.getenv("WARM_UP", "")
+
+
+def _warm_llm():
+    from llm_client import llm_client
+    llm_client.get_model()
+
+
+def _warm_face_detection():
+    from face_executor import face_executor
+    face_executor.start()
+
+
+def _warm_pdf():
+    ensure_loaded("reportlab.platypus")
+
+
+def _warm_audio():
+    from tts_manager import tts_manager
+    tts_manager.ensure_mixer()
+
+
+def _warm_microphone():
+    from tts_manager import tts_manager
+    tts_manager.ensure_microphone()
+
+
+COMPONENTS = {
+    "llm": _warm_llm,
+    "face_detection": _warm_face_detection,
+    "pdf": _warm_pdf,
+    "audio": _warm_audio,
+    "microphone": _warm_microphone,
+}
+
+
+def warm_up(spec=WARM_UP):
+    """
+    Pay the lazy initialization cost of the named components now instead of on
+    the first request. Returns {component: seconds}; failures are logged, not raised.
+    """
+    names = [name.strip().lower() for name in spec.split(",") if name.strip()]
+    if "all" in names:
+        names = list(COMPONENTS)
+    timings = {}
+    for name in names:
+        step = COMPONENTS.get(name)
+        if step is None:
+            print(f"ERROR: unknown warm-up component {name!r}; choose from {sorted(COMPONENTS)}")
+            continue
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            print(f"ERROR warming up {name}: {e}")
+            continue
+        timings[name] = time.perf_counter() - started
+        print(f"DEBUG: warmed up {name} in {timings[name]:.2f}s")
+    return timings
@@ -35,7 +35,7 @@ function Home() {
 
       console.log('API Response:', response.data);
 
-      const { session_id, intro, question, audio } = response.data;
+      const { session_id, intro, question, audio, audio_url } = response.data;
 
       if (!session_id || !intro || !question) {
         console.error('Invalid response from backend:', response.data);
@@ -49,7 +49,7 @@ function Home() {
       localStorage.setItem('session_id', session_id);
       localStorage.setItem('intro', intro);
       localStorage.setItem('first_question', question);
-      localStorage.setItem('first_audio', audio || '');
+      localStorage.setItem('first_audio', audio || audio_url || '');
 
       console.log('Stored data in localStorage:', {
         session_id, intro, question, audio: audio ? 'present' : 'none'
@@ -161,14 +161,14 @@ function Interview() {
 
           console.log('Backend response:', response.data);
 
-          const { session_id: newSessionId, intro: newIntro, question: newQuestion, audio } = response.data;
+          const { session_id: newSessionId, intro: newIntro, question: newQuestion, audio, audio_url } = response.data;
 
           if (newSessionId && newIntro && newQuestion) {
             // Store the data
             localStorage.setItem('session_id', newSessionId);
             localStorage.setItem('intro', newIntro);
             localStorage.setItem('first_question', newQuestion);
-            localStorage.setItem('first_audio', audio || '');
+            localStorage.setItem('first_audio', audio || audio_url || '');
 
             // Update state
             storedIntro = newIntro;
@@ -540,7 +540,9 @@ function Interview() {
     if (audioBase64) {
       console.log('Using backend audio');
       try {
-        const audio = new Audio(`data:audio/mp3;base64,${audioBase64}`);
+        // Backend sends either an audio URL or (older builds) base64 MP3
+        const isUrl = /^(\/|https?:)/.test(audioBase64);
+        const audio = new Audio(isUrl ? audioBase64 : `data:audio/mp3;base64,${audioBase64}`);
         audioRef.current = audio;
         speakStateRef.current = 'mp3';
         audio.onplay = () => console.log('Backend audio started');
@@ -652,7 +654,8 @@ function Interview() {
       console.log('Backend response received:', res.data);
       console.log('Response type:', typeof res.data);
 
-      const { feedback, decision, next_question, audio } = res.data;
+      const { feedback, decision, next_question, audio_url } = res.data;
+      const audio = res.data.audio || audio_url;
 
       console.log('Parsed response:', { feedback, decision, next_question, audio: audio ? 'present' : 'none' });
 
@@ -1131,7 +1134,8 @@ function Interview() {
 
                 console.log('Submit response:', res.data);
 
-                const { feedback, decision, next_question, audio } = res.data;
+                const { feedback, decision, next_question, audio_url } = res.data;
+                const audio = res.data.audio || audio_url;
 
                 if (feedback && next_question) {
                   console.log('Updating UI with new feedback and question');
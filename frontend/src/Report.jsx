@@ -4,7 +4,7 @@ import { useNavigate } from 'react-router-dom';
 
 function Report() {
   const [report, setReport] = useState('');
-  const [pdfBase64, setPdfBase64] = useState('');
+  const [pdfUrl, setPdfUrl] = useState('');
   const [loading, setLoading] = useState(true);
   const sessionId = localStorage.getItem('session_id');
   const navigate = useNavigate();
@@ -23,11 +23,21 @@ function Report() {
         
         console.log('Report response:', res.data);
         
-        if (res.data.pdf_base64) {
+        // 202: the report is still being built in the background, poll its job
+        let data = res.data;
+        while (data.status_url && !['done', 'failed'].includes(data.report_status)) {
+          await new Promise(resolve => setTimeout(resolve, 1000));
+          const poll = await axios.get(data.status_url, { params: { wait: 5 } });
+          data = poll.data;
+        }
+        
+        if (data.report_status === 'failed') {
+          setReport(data.error || 'Failed to generate report.');
+        } else if (data.download_url) {
           setReport('PDF report generated successfully');
-          setPdfBase64(res.data.pdf_base64);
+          setPdfUrl(data.download_url);
         } else {
-          setReport(res.data.report || 'No report available');
+          setReport(data.text_report || data.report || 'No report available');
         }
       } catch (error) {
         console.error("Error fetching report:", error);
@@ -41,7 +51,7 @@ function Report() {
   }, [sessionId, navigate]);
 
   const downloadPDF = () => {
-    if (!pdfBase64) {
+    if (!pdfUrl) {
       alert('PDF not available');
       return;
     }
@@ -49,7 +59,7 @@ function Report() {
     try {
       // Create download link
       const link = document.createElement('a');
-      link.href = `data:application/pdf;base64,${pdfBase64}`;
+      link.href = pdfUrl;
       link.download = `Interview_Report_${new Date().toISOString().split('T')[0]}.pdf`;
       document.body.appendChild(link);
       link.click();
@@ -107,7 +117,7 @@ function Report() {
           <p><strong>Generated:</strong> {new Date().toLocaleString()}</p>
         </div>
 
-        {pdfBase64 ? (
+        {pdfUrl ? (
           <div style={{ textAlign: 'center', marginBottom: '2rem' }}>
             <p style={{ 
               color: '#4caf50', 
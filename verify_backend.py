@@ -25,10 +25,11 @@ def test_interview_flow():
             print(f"✅ Interview Started. Session ID: {session_id}")
             print(f"   Intro: {intro}")
             print(f"   Question: {first_question}")
-            if data.get("audio"):
-                print("✅ Audio received in Start response.")
+            # Speech is synthesized in the background; responses carry a URL to fetch it from
+            if data.get("audio_url") or data.get("audio_id"):
+                print(f"✅ Audio job queued in Start response: {data.get('audio_url')}")
             else:
-                print("❌ No Audio in Start response.")
+                print("❌ No Audio job in Start response.")
         else:
             print("❌ Failed to start interview correctly.")
             return
@@ -55,10 +56,11 @@ def test_interview_flow():
             print(f"   Feedback: {feedback}")
             print(f"   Next Question: {next_q}")
             print(f"   Decision: {decision}")
-            if data.get("audio"):
-                print("✅ Audio received in Answer response.")
+            # Speech is synthesized in the background; responses carry a URL to fetch it from
+            if data.get("audio_url") or data.get("audio_id"):
+                print(f"✅ Audio job queued in Answer response: {data.get('audio_url')}")
             else:
-                print("❌ No Audio in Answer response.")
+                print("❌ No Audio job in Answer response.")
         else:
             print("❌ Failed to process answer.")
     except Exception as e: